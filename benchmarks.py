@@ -0,0 +1,397 @@
+"""Benchmark suite for the simulator engines, the decay log and plotting.
+
+    python benchmarks.py suite --out bench.json       # everything below
+    python benchmarks.py engines --max-atoms 1e8      # atoms/s per engine
+    python benchmarks.py decay_log                    # memory per entry, query latency
+    python benchmarks.py plot                         # render time vs point count
+    python benchmarks.py compaction                   # numpy engine with/without compaction
+    python benchmarks.py rng                          # throughput of each RNG backend
+    python benchmarks.py threads --atoms 1e9          # numpy step scaling with threads
+    python benchmarks.py compare base.json bench.json # flag regressions between runs
+
+Results are JSON, with the commit and machine they were measured on, so runs
+from different commits on the same box can be compared.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+
+from radioactive_decay_visualizer import (
+    ENGINES, RNG_BACKENDS, DecayLog, RadioactiveDecaySimulator, make_rng,
+    minmax_decimate)
+
+# Largest population each engine is benchmarked with by default; the python
+# loop and the event engine's per-atom lifetimes run out of time or memory
+# long before 10^9
+ENGINE_MAX_ATOMS = {"python": 10 ** 6, "numpy": 10 ** 9, "binomial": 10 ** 9, "event": 10 ** 7}
+
+
+def _best_of(func, repeat=3):
+    """Smallest wall time of ``repeat`` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def machine_info():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def bench_engines(max_atoms=10 ** 9, num_steps=5, seed=1):
+    """Atoms stepped per second for each engine at 10^3 .. max_atoms atoms."""
+    results = {}
+    for engine in ENGINES:
+        results[engine] = {}
+        for exponent in range(3, 10):
+            num_atoms = 10 ** exponent
+            if num_atoms > min(max_atoms, ENGINE_MAX_ATOMS[engine]):
+                break
+            simulator = RadioactiveDecaySimulator(engine=engine, seed=seed)
+            start = time.perf_counter()
+            simulator.initialize(num_atoms)
+            init_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            for step in range(1, num_steps + 1):
+                simulator.advance(step, 0.0137)  # Δt = T½ / 50
+            step_seconds = time.perf_counter() - start
+            results[engine][str(num_atoms)] = {
+                "init_seconds": init_seconds,
+                "step_seconds": step_seconds / num_steps,
+                "atoms_per_second": num_atoms * num_steps / step_seconds,
+            }
+            del simulator
+    return {"num_steps": num_steps, "results": results}
+
+
+def bench_decay_log(num_records=10 ** 7, num_steps=1000, num_queries=10000, seed=1):
+    """Append throughput, memory per entry and per-query latency of DecayLog."""
+    rng = np.random.default_rng(seed)
+    per_step = np.full(num_steps, num_records // num_steps)
+    atom_ids = np.arange(num_records, dtype=np.uint32)
+
+    log = DecayLog()
+    start = time.perf_counter()
+    offset = 0
+    for step, count in enumerate(per_step):
+        log.extend(atom_ids[offset:offset + count], step)
+        offset += count
+    extend_seconds = time.perf_counter() - start
+
+    single = DecayLog()
+    num_appends = 10 ** 5
+    start = time.perf_counter()
+    for atom_id in range(num_appends):
+        single.append(atom_id, atom_id // 100)
+    append_seconds = time.perf_counter() - start
+
+    steps = rng.integers(0, num_steps, num_queries).tolist()
+
+    def latency(query):
+        start = time.perf_counter()
+        for step in steps:
+            query(step)
+        return (time.perf_counter() - start) / num_queries
+
+    # Queries between appends, as while a run is still being logged: each
+    # burst may open a new chunk, so straddling steps must stay cheap
+    growing = DecayLog()
+    burst = max(int(per_step[0]), 1)
+    start = time.perf_counter()
+    for step in range(num_steps):
+        growing.extend(atom_ids[:burst], step)
+        growing.get_decays_at_step(step)
+    interleaved_seconds = time.perf_counter() - start
+
+    allocated = log.nbytes + log._step_starts.nbytes
+    return {
+        "num_records": log.size,
+        "bytes_per_entry": log.nbytes / log.size,
+        "allocated_bytes_per_entry": allocated / log.size,
+        "extend_records_per_second": log.size / extend_seconds,
+        "append_records_per_second": num_appends / append_seconds,
+        "count_at_step_latency_seconds": latency(log.get_decay_count_at_step),
+        "decays_at_step_latency_seconds": latency(log.get_decays_at_step),
+        "step_range_latency_seconds": latency(
+            lambda step: log.get_decays_in_step_range(step, step + 10)),
+        "all_decays_latency_seconds": _best_of(log.get_all_decays),
+        "append_then_query_latency_seconds": interleaved_seconds / num_steps,
+    }
+
+
+def _decay_series(num_points, seed=1):
+    rng = np.random.default_rng(seed)
+    steps = np.arange(num_points)
+    remaining = np.maximum(
+        1e6 * np.exp(-steps * (20 * np.log(2) / num_points))
+        + rng.normal(0, 100, num_points), 0).astype(np.int64)
+    return steps, remaining, 10 ** 6 - remaining
+
+
+def bench_plot(point_counts=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)):
+    """Render time of a finished run against its number of points.
+
+    Uses DecayVisualizerApp.visualize_decay on a hidden Tk window when a
+    display is available. Headless boxes time the same pipeline (min/max
+    decimation to the axes width, then lines and fills on an Agg canvas).
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        root = None
+
+    results = {}
+    if root is not None:
+        from decay_visualizer_gui import DecayVisualizerApp
+        root.withdraw()
+        app = DecayVisualizerApp(root)
+        renderer = "tk"
+
+        def render(series):
+            app.visualize_decay(*series, delta_t_days=1.0)
+            app.canvas.draw()
+    else:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=(10, 6), dpi=100)
+        canvas = FigureCanvasAgg(figure)
+        renderer = "agg"
+
+        def render(series):
+            steps, remaining, decayed = series
+            figure.clear()
+            ax1, ax2 = figure.subplots(2, 1)
+            buckets = ax1.bbox.width
+            for values in (remaining, decayed):
+                x, y = minmax_decimate(steps, values, buckets)
+                ax1.plot(x, y)
+                ax1.fill_between(x, y, alpha=0.2)
+            ax2.plot(*minmax_decimate(steps, np.diff(decayed, prepend=0), buckets),
+                     drawstyle='steps-mid')
+            canvas.draw()
+
+    for num_points in point_counts:
+        series = _decay_series(num_points)
+        results[str(num_points)] = {"render_seconds": _best_of(lambda: render(series))}
+    if root is not None:
+        root.destroy()
+    return {"renderer": renderer, "results": results}
+
+
+def bench_compaction(num_atoms=10 ** 7, half_lives=20, balanced_fraction=50, seed=1):
+    """Time a full run of the numpy engine with compaction on and off.
+
+    Without compaction every step scans the whole bitset, so the run costs
+    O(num_atoms * steps); with it the steps after the switch cost
+    O(current_remaining), which sums to O(num_atoms * half-lives simulated).
+    """
+    num_steps = int(half_lives * balanced_fraction)
+    results = {}
+    for label, ratio in (("compacted", RadioactiveDecaySimulator.COMPACT_RATIO),
+                         ("bitset_only", 0)):
+        simulator = RadioactiveDecaySimulator(engine="numpy", seed=seed)
+        simulator.COMPACT_RATIO = ratio
+        start = time.perf_counter()
+        records = simulator.iter_simulation(
+            num_atoms, 1.0, "days", num_steps, balanced_fraction)
+        # Seconds spent in each simulated half-life
+        per_half_life = [0.0] * (half_lives + 1)
+        last = start
+        for step, remaining, _, _ in records:
+            now = time.perf_counter()
+            per_half_life[min(step // balanced_fraction, half_lives)] += now - last
+            last = now
+        results[label] = {
+            "seconds": last - start,
+            "steps": num_steps,
+            "remaining": remaining,
+            "seconds_per_half_life": per_half_life[:half_lives],
+        }
+    results["speedup"] = results["bitset_only"]["seconds"] / results["compacted"]["seconds"]
+    return {"num_atoms": num_atoms, "half_lives": half_lives,
+            "balanced_fraction": balanced_fraction, "results": results}
+
+
+def bench_rng(num_draws=10 ** 7, buffer_size=1 << 20, seed=1):
+    """Uniforms per second of each RNG backend filling a preallocated buffer,
+    and atoms per second of one numpy-engine step drawing from it."""
+    results = {}
+    buffer = np.empty(buffer_size)
+    for backend in RNG_BACKENDS:
+        rng = make_rng(backend, seed)
+        start = time.perf_counter()
+        for chunk, offset in enumerate(range(0, num_draws, buffer_size)):
+            rng.fill(buffer[:min(buffer_size, num_draws - offset)], 1, chunk)
+        fill_seconds = time.perf_counter() - start
+
+        simulator = RadioactiveDecaySimulator(engine="numpy", seed=seed, rng_backend=backend)
+        simulator.initialize(num_draws)
+        start = time.perf_counter()
+        simulator.advance(1, 0.0137)
+        step_seconds = time.perf_counter() - start
+        results[backend] = {
+            "draws_per_second": num_draws / fill_seconds,
+            "numpy_step_atoms_per_second": num_draws / step_seconds,
+        }
+    return {"num_draws": num_draws, "buffer_size": buffer_size, "results": results}
+
+
+def bench_threads(num_atoms=10 ** 8, max_threads=None, decay_prob=0.0137, seed=1):
+    """Atoms per second of one numpy-engine step (counter backend) at 1, 2, 4, ...
+    threads up to ``max_threads`` (default: the CPU count)."""
+    max_threads = max_threads or os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max_threads:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_threads:
+        counts.append(max_threads)
+
+    results = {}
+    for threads in counts:
+        simulator = RadioactiveDecaySimulator(
+            engine="numpy", seed=seed, rng_backend="counter", threads=threads)
+        simulator.initialize(num_atoms)
+        simulator.advance(1, decay_prob)  # Starts the pool and touches the buffers
+        start = time.perf_counter()
+        simulator.advance(2, decay_prob)
+        seconds = time.perf_counter() - start
+        results[str(threads)] = {
+            "step_seconds": seconds,
+            "atoms_per_second": num_atoms / seconds,
+        }
+    base = results["1"]["step_seconds"]
+    for result in results.values():
+        result["speedup"] = base / result["step_seconds"]
+    return {"num_atoms": num_atoms, "results": results}
+
+
+def run_suite(max_atoms=10 ** 9):
+    return {
+        "engines": bench_engines(max_atoms),
+        "decay_log": bench_decay_log(),
+        "plot": bench_plot(),
+        "rng": bench_rng(),
+    }
+
+
+def _metrics(result, prefix=""):
+    """Flatten a result into {"path/to/metric": value} for comparison."""
+    metrics = {}
+    for key, value in result.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            metrics.update(_metrics(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[path] = value
+    return metrics
+
+
+def compare(base, new, threshold=0.10):
+    """Return (metric, base, new, change) rows that got worse by more than threshold.
+
+    ``*_per_second`` metrics should go up; ``*seconds`` and ``*bytes*``
+    metrics should go down. Everything else is not compared.
+    """
+    base_metrics = _metrics(base.get("benchmarks", base))
+    new_metrics = _metrics(new.get("benchmarks", new))
+    regressions = []
+    for path, old in base_metrics.items():
+        if path not in new_metrics or old == 0:
+            continue
+        name = path.rsplit("/", 1)[-1]
+        if name.endswith("per_second"):
+            change = (old - new_metrics[path]) / old
+        elif name.endswith("seconds") or "bytes" in name:
+            change = (new_metrics[path] - old) / old
+        else:
+            continue
+        if change > threshold:
+            regressions.append((path, old, new_metrics[path], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("suite", "engines", "decay_log", "plot", "compaction", "rng", "threads"):
+        command = commands.add_parser(name)
+        command.add_argument("--out", help="write the JSON here instead of stdout")
+        if name in ("suite", "engines"):
+            command.add_argument("--max-atoms", type=float, default=1e9)
+        if name in ("compaction", "rng", "threads"):
+            command.add_argument("--atoms", type=float, default=1e7,
+                                 help="atoms simulated (draws for the rng benchmark)")
+        if name == "threads":
+            command.add_argument("--max-threads", type=int)
+        if name == "compaction":
+            command.add_argument("--half-lives", type=int, default=20)
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.threshold)
+        for path, old, value, change in regressions:
+            sys.stdout.write(f"{path}: {old:.6g} -> {value:.6g} ({change:+.1%} worse)\n")
+        if not regressions:
+            sys.stdout.write("no regressions\n")
+        return 1 if regressions else 0
+
+    if args.command == "suite":
+        benchmarks = run_suite(int(args.max_atoms))
+    elif args.command == "engines":
+        benchmarks = bench_engines(int(args.max_atoms))
+    elif args.command == "decay_log":
+        benchmarks = bench_decay_log()
+    elif args.command == "plot":
+        benchmarks = bench_plot()
+    elif args.command == "compaction":
+        benchmarks = bench_compaction(int(args.atoms), args.half_lives)
+    elif args.command == "threads":
+        benchmarks = bench_threads(int(args.atoms), args.max_threads)
+    else:
+        benchmarks = bench_rng(int(args.atoms))
+
+    result = {"machine": machine_info(), "command": args.command, "benchmarks": benchmarks}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
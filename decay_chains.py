@@ -0,0 +1,250 @@
+"""Multi-nuclide decay chains built from the "daughter" links in NUCLIDES.
+
+A chain is advanced with its exact one-step transition matrix
+T = expm(A * Δt), where A is the generator of the decay graph: T[i, j] is the
+probability that an atom which starts a step as species i ends it as species
+j, including every intermediate decay within the step. The stochastic mode
+draws one multinomial per species from its row of T, so there is no
+per-atom state and short-lived daughters are handled exactly at any Δt. The
+"bateman" mode applies T to the expected populations instead, which is the
+exact solution of the Bateman equations sampled at the step times.
+"""
+import math
+import numpy as np
+
+from radioactive_decay_visualizer import CHAIN_NUCLIDES, ISOTOPES, to_days
+
+CHAIN_MODES = ("stochastic", "bateman")
+# The isotope table plus the intermediate nuclides only chains use
+NUCLIDES = {**ISOTOPES, **CHAIN_NUCLIDES}
+
+
+def _daughters(name, isotopes):
+    """Return {daughter: branching ratio} for one nuclide (empty if stable)."""
+    entry = isotopes.get(name)
+    if entry is None:
+        return {}
+    if entry.get("half_life") is None:
+        raise ValueError(f"'{name}' has no half-life to build a chain from.")
+    daughter = entry.get("daughter")
+    if daughter is None:
+        # Products that the table does not name are collected in one sink
+        return {f"{name} decay products": 1.0}
+    if isinstance(daughter, str):
+        return {daughter: 1.0}
+    total = sum(daughter.values())
+    if not math.isclose(total, 1.0, rel_tol=1e-9):
+        raise ValueError(f"Branching ratios of '{name}' sum to {total}, not 1.")
+    return dict(daughter)
+
+
+def build_decay_chain(parent, isotopes=None):
+    """Walk the daughter graph from ``parent``.
+
+    Returns (species, decay_constants, branching): species names in
+    topological order (parent first), decay constants per day (0 for stable
+    nuclides) and a matrix whose entry [i, j] is the fraction of species i
+    decays that produce species j.
+    """
+    isotopes = NUCLIDES if isotopes is None else isotopes
+    if parent not in isotopes:
+        raise ValueError(f"Unknown isotope '{parent}'.")
+
+    order = []
+    state = {}  # name -> "visiting" | "done"
+
+    def visit(name):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Decay graph has a cycle through '{name}'.")
+        state[name] = "visiting"
+        for daughter in _daughters(name, isotopes):
+            visit(daughter)
+        state[name] = "done"
+        order.append(name)
+
+    visit(parent)
+    species = order[::-1]
+    index = {name: i for i, name in enumerate(species)}
+
+    decay_constants = np.zeros(len(species))
+    branching = np.zeros((len(species), len(species)))
+    for i, name in enumerate(species):
+        entry = isotopes.get(name)
+        if entry is None:
+            continue
+        decay_constants[i] = math.log(2) / to_days(entry["half_life"], entry["unit"])
+        for daughter, ratio in _daughters(name, isotopes).items():
+            branching[i, index[daughter]] = ratio
+    return species, decay_constants, branching
+
+
+def _expm(matrix):
+    """Matrix exponential by scaling and squaring of a Taylor series.
+
+    Decay generators are stiff (Po-214 and U-238 differ by ~10^20 in decay
+    rate), so the matrix is scaled until its norm is below 1/2 and squared
+    back up afterwards. The squaring works on E = expm - I, as
+    (I + E)^2 = I + (2E + E @ E), so the tiny per-step decay probabilities of
+    long-lived species are not rounded away against the 1 on the diagonal.
+    """
+    norm = np.abs(matrix).sum(axis=1).max()
+    squarings = max(0, int(math.ceil(math.log2(norm))) + 1) if norm > 0.5 else 0
+    scaled = matrix / 2.0 ** squarings
+
+    excess = np.zeros_like(scaled)
+    term = np.eye(len(matrix))
+    for k in range(1, 30):
+        term = term @ scaled / k
+        excess += term
+        if np.abs(term).max() < 1e-18:
+            break
+    for _ in range(squarings):
+        excess = 2.0 * excess + excess @ excess
+    return np.eye(len(matrix)) + excess
+
+
+class DecayChainSimulator:
+    def __init__(self, parent, seed=None, isotopes=None):
+        self.parent = parent
+        self.species, self.decay_constants, self.branching = build_decay_chain(
+            parent, isotopes)
+        self.seed = seed
+        self.rng = None
+        self.delta_t_days = None
+        self.populations = None
+
+    def default_step_days(self, balanced_fraction=50):
+        """Δt = T½(parent) / balanced_fraction, as for single isotopes."""
+        parent_constant = self.decay_constants[0]
+        if parent_constant <= 0:
+            raise ValueError("Half-life must be positive.")
+        return math.log(2) / parent_constant / float(balanced_fraction)
+
+    def transition_matrix(self, delta_t_days):
+        """Row-stochastic matrix of where each species ends up after Δt."""
+        if delta_t_days <= 0:
+            raise ValueError("Delta t must be positive.")
+        generator = self.decay_constants[:, None] * self.branching
+        generator[np.diag_indices_from(generator)] -= self.decay_constants
+        transition = np.clip(_expm(generator * delta_t_days), 0.0, 1.0)
+        # Squaring leaves rounding noise; every row is a probability vector
+        return transition / transition.sum(axis=1, keepdims=True)
+
+    def _initial_populations(self, num_atoms, initial):
+        populations = np.zeros(len(self.species), dtype=np.int64)
+        if initial is None:
+            populations[0] = num_atoms
+            return populations
+        for name, count in initial.items():
+            if name not in self.species:
+                raise ValueError(f"'{name}' is not part of the {self.parent} chain.")
+            populations[self.species.index(name)] = count
+        return populations
+
+    def iter_simulation(self, num_atoms, num_steps, delta_t_days=None, balanced_fraction=50,
+                        mode="stochastic", initial=None):
+        """Yield (step, populations) for steps 0..num_steps.
+
+        ``populations`` is a fresh array ordered like ``self.species``: int64
+        counts in stochastic mode, expected (float) counts in bateman mode.
+        ``initial`` optionally maps species names to starting counts instead
+        of putting all ``num_atoms`` in the parent.
+        """
+        if mode not in CHAIN_MODES:
+            raise ValueError(
+                f"Unknown mode '{mode}'. Choose from: {', '.join(CHAIN_MODES)}.")
+        if delta_t_days is None:
+            delta_t_days = self.default_step_days(balanced_fraction)
+        self.delta_t_days = delta_t_days
+        transition = self.transition_matrix(delta_t_days)
+
+        populations = self._initial_populations(num_atoms, initial)
+        if mode == "bateman":
+            populations = populations.astype(float)
+        else:
+            self.rng = np.random.default_rng(self.seed)
+        self.populations = populations
+        yield 0, populations.copy()
+
+        for step in range(1, num_steps + 1):
+            if mode == "bateman":
+                populations = populations @ transition
+            else:
+                # One multinomial per species over where its atoms end up
+                populations = self.rng.multinomial(populations, transition).sum(axis=0)
+            self.populations = populations
+            yield step, populations.copy()
+
+    def iter_adaptive(self, num_atoms, duration_days, tolerance=0.05, min_step_days=None,
+                      mode="stochastic", initial=None, max_growth=2.0):
+        """Yield (step, time_days, populations) with Δt adapted to the chain.
+
+        A step is accepted when no species is expected to change by more
+        than ``tolerance`` of its population (populations below
+        1 / tolerance² count as that floor) plus one sigma of its counting
+        noise. Rejected steps are halved, accepted ones grow by up
+        to ``max_growth``. Δt starts at ``min_step_days`` (default: the
+        shortest half-life in the chain / 50), so the ingrowth of short-lived
+        daughters is resolved and the long equilibrium phase is crossed in
+        a few large steps. The last step lands exactly on ``duration_days``.
+        """
+        if mode not in CHAIN_MODES:
+            raise ValueError(
+                f"Unknown mode '{mode}'. Choose from: {', '.join(CHAIN_MODES)}.")
+        if duration_days <= 0:
+            raise ValueError("Duration must be positive.")
+        if tolerance <= 0:
+            raise ValueError("Tolerance must be positive.")
+        if min_step_days is None:
+            min_step_days = math.log(2) / self.decay_constants.max() / 50.0
+        floor = 1.0 / tolerance ** 2
+
+        populations = self._initial_populations(num_atoms, initial)
+        if mode == "bateman":
+            populations = populations.astype(float)
+        else:
+            self.rng = np.random.default_rng(self.seed)
+        self.delta_t_days = min_step_days
+        self.populations = populations
+        yield 0, 0.0, populations.copy()
+
+        time_days = 0.0
+        step_days = min_step_days
+        step = 0
+        while time_days < duration_days:
+            step_days = min(step_days, duration_days - time_days)
+            transition = self.transition_matrix(step_days)
+            expected = populations @ transition
+            # Changes within one sigma of counting noise are not resolved:
+            # in stochastic mode small populations relax back from their own
+            # fluctuations every step, which would otherwise pin Δt down
+            larger = np.maximum(populations, expected)
+            allowed = tolerance * np.maximum(larger, floor) + np.sqrt(larger)
+            change = (np.abs(expected - populations) / allowed).max()
+            if change > 1.0 and step_days > min_step_days:
+                step_days = max(step_days / 2.0, min_step_days)
+                continue
+
+            if mode == "bateman":
+                populations = expected
+            else:
+                populations = self.rng.multinomial(populations, transition).sum(axis=0)
+            step += 1
+            time_days += step_days
+            self.populations = populations
+            yield step, time_days, populations.copy()
+            # Grow towards the step that would just meet the tolerance
+            growth = max_growth if change == 0 else 0.9 / change
+            step_days *= min(max(growth, 1.0), max_growth)
+
+    def run_simulation(self, num_atoms, num_steps, delta_t_days=None, balanced_fraction=50,
+                       mode="stochastic", initial=None):
+        """Return (time_steps, populations, delta_t_days).
+
+        ``populations`` has one row per step and one column per species.
+        """
+        rows = [populations for _, populations in self.iter_simulation(
+            num_atoms, num_steps, delta_t_days, balanced_fraction, mode, initial)]
+        return np.arange(len(rows)), np.vstack(rows), self.delta_t_days
@@ -0,0 +1,235 @@
+"""Checkpoint and resume for long fixed-step simulations.
+
+A checkpoint directory holds:
+
+    state.json    run parameters, seed, the last checkpointed step, its
+                  remaining count, the decay log position, the number of
+                  series rows and the RNG state
+    series.bin    int64 rows (step, remaining, decayed), one per step
+    decays.log    the run's MappedDecayLog, unless the simulator has its
+                  own decay_log_path
+
+Checkpoints are incremental: the series and the decay log are only
+appended to, so a checkpoint flushes what was added since the previous one
+and rewrites the small state.json. Survivor state is never written, as every
+atom missing from the decay log is still undecayed (see
+RadioactiveDecaySimulator.restore). state.json is replaced atomically after
+the data it points at is on disk; anything written after it is cut off when
+the run resumes, so a resumed run continues bit-identically.
+"""
+import json
+import os
+import time
+import numpy as np
+
+from radioactive_decay_visualizer import (
+    MappedDecayLog, seed_from_json, seed_to_json, write_atomically)
+
+CHECKPOINT_FORMAT_VERSION = 1
+STATE_NAME = "state.json"
+SERIES_NAME = "series.bin"
+LOG_NAME = "decays.log"
+SERIES_COLUMNS = 3  # step, remaining, decayed
+# Steps buffered in memory between writes to series.bin
+SERIES_CHUNK_STEPS = 4096
+
+# Run parameters a checkpoint must match to be resumed
+_RUN_KEYS = ("num_atoms", "half_life_value", "half_life_unit", "num_steps",
+             "balanced_fraction", "engine", "rng_backend")
+
+
+def load_checkpoint(checkpoint_dir):
+    """Return the saved state of ``checkpoint_dir``, or None if there is none."""
+    path = os.path.join(checkpoint_dir, STATE_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        state = json.load(f)
+    if state.get("format_version") != CHECKPOINT_FORMAT_VERSION:
+        raise ValueError(f"{checkpoint_dir} was written by an unsupported checkpoint version.")
+    return state
+
+
+class CheckpointedRun:
+    """A fixed-step run that checkpoints itself to a directory and resumes from it.
+
+    Iterating yields (step, remaining, decayed_total, newly_decayed) like
+    RadioactiveDecaySimulator.iter_simulation. If ``checkpoint_dir``
+    already holds a checkpoint of the same run, the run continues after its
+    last step, which is yielded first in place of step 0. An unseeded
+    simulator is given a fresh seed, so the run can be resumed.
+
+    Checkpoints are at least ``interval_seconds`` apart, and after each one
+    the next waits until its cost is at most ``max_overhead`` of the time
+    spent simulating. A final checkpoint is written when the run ends or
+    the caller stops iterating.
+    """
+
+    def __init__(self, simulator, checkpoint_dir, num_atoms, half_life_value, half_life_unit,
+                 num_steps, balanced_fraction=50, interval_seconds=60.0, max_overhead=0.02):
+        if interval_seconds < 0 or max_overhead <= 0:
+            raise ValueError("Checkpoint interval and overhead must be positive.")
+        if not simulator.keep_decay_log and simulator.engine != "binomial":
+            raise ValueError("Resuming rebuilds the survivors from the decay log, so keep it.")
+        self.simulator = simulator
+        self.checkpoint_dir = checkpoint_dir
+        self.run = {
+            "num_atoms": int(num_atoms), "half_life_value": half_life_value,
+            "half_life_unit": half_life_unit, "num_steps": int(num_steps),
+            "balanced_fraction": balanced_fraction, "engine": simulator.engine,
+            "rng_backend": simulator.rng_backend,
+        }
+        self.interval_seconds = interval_seconds
+        self.max_overhead = max_overhead
+        self.state_path = os.path.join(checkpoint_dir, STATE_NAME)
+        self.series_path = os.path.join(checkpoint_dir, SERIES_NAME)
+        self.resumed_from = None  # Step the run continued after, if it resumed
+        self.checkpoints = 0
+        self.checkpoint_seconds = 0.0
+        self._series = None
+        self._pending = []
+        self._series_rows = 0
+        self._next_due = 0.0
+
+    def _start(self):
+        simulator = self.simulator
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        state = load_checkpoint(self.checkpoint_dir)
+        if state is not None:
+            for key in _RUN_KEYS:
+                if state[key] != self.run[key]:
+                    raise ValueError(
+                        f"{self.checkpoint_dir} holds a run with {key}={state[key]!r}, "
+                        f"not {self.run[key]!r}.")
+            saved_seed = seed_from_json(state["seed"])
+            if simulator.seed is None:
+                simulator.seed = saved_seed
+            elif seed_to_json(simulator.seed) != seed_to_json(saved_seed):
+                raise ValueError(f"{self.checkpoint_dir} holds a run with another seed.")
+            if simulator.decay_log_path is None:
+                simulator.decay_log_path = state["decay_log_path"]
+        elif simulator.seed is None:
+            simulator.seed = np.random.SeedSequence().entropy
+        if simulator.decay_log_path is None and simulator.engine != "binomial":
+            simulator.decay_log_path = os.path.join(self.checkpoint_dir, LOG_NAME)
+
+        simulator.delta_t_days, decay_prob = simulator.calculate_step_size(
+            self.run["half_life_value"], self.run["half_life_unit"],
+            self.run["balanced_fraction"])
+        if state is None:
+            simulator.initialize(self.run["num_atoms"])
+            self._series = open(self.series_path, "wb")
+            record = (0, simulator.num_atoms, 0, 0)
+            self._pending.append(record[:SERIES_COLUMNS])
+            self._save(record)
+            complete = False
+        else:
+            decay_log = None
+            if simulator.engine != "binomial":
+                decay_log = MappedDecayLog(simulator.decay_log_path, "r+")
+                decay_log.rewind(state["log_size"], state["log_last_step"])
+            simulator.restore(self.run["num_atoms"], state["remaining"], decay_log,
+                              state["rng_state"])
+            # Rows written after the checkpoint are dropped with the records
+            self._series_rows = state["series_rows"]
+            self._series = open(self.series_path, "r+b")
+            self._series.truncate(self._series_rows * SERIES_COLUMNS * 8)
+            self._series.seek(0, os.SEEK_END)
+            record = tuple(state["last_record"])
+            self.resumed_from = record[0]
+            complete = state["complete"]
+        self._next_due = time.perf_counter() + self.interval_seconds
+        return record, decay_prob, complete
+
+    def _save(self, record, complete=False):
+        """Flush the series and decay log, then point state.json at them."""
+        started = time.perf_counter()
+        simulator = self.simulator
+        self._write_pending()
+        self._series.flush()
+        os.fsync(self._series.fileno())
+        decay_log = simulator.decay_list
+        if decay_log is not None:
+            decay_log.flush()
+        state = dict(
+            self.run, format_version=CHECKPOINT_FORMAT_VERSION,
+            seed=seed_to_json(simulator.seed), delta_t_days=simulator.delta_t_days,
+            decay_log_path=simulator.decay_log_path,
+            last_record=list(record), remaining=simulator.current_remaining,
+            series_rows=self._series_rows, complete=complete,
+            log_size=decay_log.size if decay_log is not None else 0,
+            log_last_step=decay_log.last_step if decay_log is not None else -1,
+            rng_state=simulator.rng.get_state())
+        write_atomically(self.state_path, lambda f: json.dump(state, f), fsync=True)
+
+        elapsed = time.perf_counter() - started
+        self.checkpoints += 1
+        self.checkpoint_seconds += elapsed
+        # Optimization: space checkpoints so their cost stays within
+        # max_overhead of the run however large the flushes get
+        self._next_due = time.perf_counter() + max(self.interval_seconds,
+                                                   elapsed / self.max_overhead)
+
+    def _write_pending(self):
+        if self._pending:
+            rows = np.asarray(self._pending, dtype=np.int64)
+            self._series.write(rows.tobytes())
+            self._series_rows += len(rows)
+            self._pending.clear()
+
+    def __iter__(self):
+        simulator = self.simulator
+        record, decay_prob, complete = self._start()
+        in_step = False
+        try:
+            yield record
+            step, remaining = record[0], record[1]
+            while not complete and step < self.run["num_steps"] and remaining > 0:
+                step += 1
+                in_step = True
+                newly_decayed = simulator.advance(step, decay_prob)
+                in_step = False
+                remaining = simulator.current_remaining
+                record = (step, remaining, simulator.num_atoms - remaining, newly_decayed)
+                self._pending.append(record[:SERIES_COLUMNS])
+                if len(self._pending) >= SERIES_CHUNK_STEPS:
+                    self._write_pending()
+                if time.perf_counter() >= self._next_due:
+                    self._save(record)
+                yield record
+            if not complete:
+                complete = True
+                self._save(record, complete=True)
+        finally:
+            # A caller leaving the loop early stops between steps, so the
+            # state is consistent and worth a checkpoint; a step that raised
+            # is not, and the run resumes from the previous checkpoint
+            if not complete and not in_step:
+                self._save(record)
+            self._series.close()
+
+    def read_series(self, stop=None):
+        """(step, remaining, decayed) rows of series.bin for steps below ``stop``.
+
+        Rows are one per step from step 0, so a resumed run can read the
+        steps it did not yield itself with ``stop=resumed_from``.
+        """
+        count = -1 if stop is None else stop * SERIES_COLUMNS
+        series = np.fromfile(self.series_path, dtype=np.int64, count=count)
+        return series.reshape(-1, SERIES_COLUMNS)
+
+    def run_to_end(self):
+        """Run (or resume) to the end; returns run_simulation's tuple.
+
+        The series is read back from series.bin, so it covers the steps
+        from before a resume too.
+        """
+        for _ in self:
+            pass
+        series = self.read_series()
+        simulator = self.simulator
+        simulator.time_steps = series[:, 0].tolist()
+        simulator.remaining_atoms = series[:, 1].tolist()
+        simulator.decayed_atoms = series[:, 2].tolist()
+        return (simulator.time_steps, simulator.remaining_atoms, simulator.decayed_atoms,
+                simulator.delta_t_days)
@@ -0,0 +1,192 @@
+"""Columnar export and import of simulation results.
+
+A run is saved as a directory with one ``.npy`` file per column and a
+``metadata.json`` describing the run:
+
+    time_steps.npy, remaining.npy, decayed.npy   int64, one row per step
+    times_days.npy                               float64, adaptive runs only
+    decays.npy                                   DECAY_RECORD rows of the decay log
+    step_starts.npy                              int64 step index of the decay log
+    metadata.json                                isotope, half-life, delta_t_days,
+                                                 seed, engine, rng backend, columns
+
+Columns are appended chunk by chunk while a run streams and the .npy header
+is filled in when the column is closed, so nothing is held in memory.
+Reading maps the files (np.load with mmap_mode="r") instead of copying them.
+metadata.json is written last, so a directory without it is an unfinished
+export. Plain .npy keeps this free of new dependencies; the files open in
+any NumPy and convert to Arrow/Parquet with a single call where pyarrow is
+installed.
+"""
+import json
+import os
+import struct
+import numpy as np
+
+from radioactive_decay_visualizer import DECAY_RECORD, DecayLog, seed_to_json, write_atomically
+
+METADATA_NAME = "metadata.json"
+EXPORT_FORMAT_VERSION = 1
+SERIES_COLUMNS = ("time_steps", "remaining", "decayed")
+
+# Every column reserves this many bytes for its .npy header so the final
+# shape can be written in place once the column is complete
+NPY_HEADER_BYTES = 256
+
+
+def _npy_header(dtype, length):
+    header = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                   'fortran_order': False, 'shape': (length,)})
+    room = NPY_HEADER_BYTES - 10  # Magic, version and header length
+    return (b'\x93NUMPY\x01\x00' + struct.pack('<H', room)
+            + header.ljust(room - 1).encode('latin1') + b'\n')
+
+
+class ColumnWriter:
+    """Append-only 1-D .npy file whose length is fixed when it is closed."""
+
+    def __init__(self, path, dtype):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+        self._file = open(path, "wb")
+        self._file.write(_npy_header(self.dtype, 0))
+
+    def append(self, values):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self._file.write(memoryview(values).cast('B'))
+        self.length += len(values)
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, self.length))
+        self._file.close()
+        self._file = None
+
+
+def run_metadata(simulator, isotope, half_life_value, half_life_unit, balanced_fraction):
+    return {
+        "format_version": EXPORT_FORMAT_VERSION,
+        "isotope": isotope,
+        "half_life_value": half_life_value,
+        "half_life_unit": half_life_unit,
+        "balanced_fraction": balanced_fraction,
+        "delta_t_days": simulator.delta_t_days,
+        "num_atoms": simulator.num_atoms,
+        "seed": seed_to_json(simulator.seed),
+        "engine": simulator.engine,
+        "rng_backend": simulator.rng_backend,
+    }
+
+
+class RunWriter:
+    """Streams the series and decay log of one run into an export directory."""
+
+    def __init__(self, out_dir, adaptive=False, with_decays=True):
+        os.makedirs(out_dir, exist_ok=True)
+        if os.path.exists(os.path.join(out_dir, METADATA_NAME)):
+            raise ValueError(f"{out_dir} already holds an export.")
+        self.out_dir = out_dir
+        names = SERIES_COLUMNS + (("times_days",) if adaptive else ())
+        self.columns = {name: ColumnWriter(os.path.join(out_dir, name + ".npy"),
+                                           np.float64 if name == "times_days" else np.int64)
+                        for name in names}
+        if with_decays:
+            self.columns["decays"] = ColumnWriter(
+                os.path.join(out_dir, "decays.npy"), DECAY_RECORD)
+        self._decays_written = 0
+
+    def write_series(self, time_steps, remaining, decayed, times_days=None):
+        self.columns["time_steps"].append(time_steps)
+        self.columns["remaining"].append(remaining)
+        self.columns["decayed"].append(decayed)
+        if times_days is not None:
+            self.columns["times_days"].append(times_days)
+
+    def write_new_decays(self, decay_log):
+        """Append the records added to ``decay_log`` since the last call."""
+        if decay_log is None or "decays" not in self.columns:
+            return
+        self.columns["decays"].append(decay_log.get_decays_since(self._decays_written))
+        self._decays_written = decay_log.size
+
+    def close(self, metadata, decay_log=None):
+        """Finish every column and write metadata.json, which marks the export complete."""
+        if decay_log is None and "decays" in self.columns:
+            # The run kept no log (e.g. a cache hit), so drop the empty column
+            decays = self.columns.pop("decays")
+            decays.close()
+            os.remove(decays.path)
+        elif decay_log is not None and "decays" in self.columns:
+            self.write_new_decays(decay_log)
+            starts = ColumnWriter(os.path.join(self.out_dir, "step_starts.npy"), np.int64)
+            starts.append(decay_log.get_step_starts())
+            self.columns["step_starts"] = starts
+        for column in self.columns.values():
+            column.close()
+        metadata = dict(metadata, columns={
+            name: {"dtype": np.lib.format.dtype_to_descr(column.dtype), "length": column.length}
+            for name, column in self.columns.items()})
+        write_atomically(os.path.join(self.out_dir, METADATA_NAME),
+                         lambda f: json.dump(metadata, f, indent=2))
+        return metadata
+
+
+def export_run(simulator, out_dir, isotope=None, half_life_value=None, half_life_unit=None,
+               balanced_fraction=None):
+    """Save the run currently held by ``simulator`` (after run_simulation / run_adaptive)."""
+    adaptive = simulator.times_days is not None
+    writer = RunWriter(out_dir, adaptive=adaptive,
+                       with_decays=simulator.decay_list is not None)
+    writer.write_series(simulator.time_steps, simulator.remaining_atoms,
+                        simulator.decayed_atoms,
+                        simulator.times_days if adaptive else None)
+    return writer.close(
+        run_metadata(simulator, isotope, half_life_value, half_life_unit, balanced_fraction),
+        simulator.decay_list)
+
+
+def stream_run(simulator, out_dir, num_atoms, half_life_value, half_life_unit, num_steps,
+               balanced_fraction=50, isotope=None, chunk_size=4096):
+    """Run a simulation and write it to ``out_dir`` chunk by chunk.
+
+    The series never accumulates in memory; decay-log records are written as
+    each chunk of steps completes. Returns the metadata.
+    """
+    writer = RunWriter(out_dir, with_decays=simulator.engine != "binomial")
+    for chunk in simulator.iter_simulation(num_atoms, half_life_value, half_life_unit,
+                                           num_steps, balanced_fraction, chunk_size=chunk_size):
+        writer.write_series(chunk[:, 0], chunk[:, 1], chunk[:, 2])
+        writer.write_new_decays(simulator.decay_list)
+    return writer.close(
+        run_metadata(simulator, isotope, half_life_value, half_life_unit, balanced_fraction),
+        simulator.decay_list)
+
+
+def load_metadata(out_dir):
+    path = os.path.join(out_dir, METADATA_NAME)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No complete export in {out_dir}")
+    with open(path) as f:
+        metadata = json.load(f)
+    if metadata.get("format_version") != EXPORT_FORMAT_VERSION:
+        raise ValueError(f"{out_dir} was written by an unsupported export version.")
+    return metadata
+
+
+def load_run(out_dir, mmap_mode="r"):
+    """Return (metadata, columns) with every column memory-mapped, not copied."""
+    metadata = load_metadata(out_dir)
+    columns = {name: np.load(os.path.join(out_dir, name + ".npy"), mmap_mode=mmap_mode)
+               for name in metadata["columns"]}
+    return metadata, columns
+
+
+def load_decay_log(out_dir):
+    """DecayLog over the exported records, queried straight from the mapped file."""
+    metadata, columns = load_run(out_dir)
+    if "decays" not in columns:
+        raise ValueError(f"The {metadata['engine']} run in {out_dir} has no decay log.")
+    return DecayLog.from_records(columns["decays"], columns["step_starts"])
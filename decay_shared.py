@@ -0,0 +1,191 @@
+"""Shared-memory result buffers for simulations run in a worker process.
+
+The series of a run (time_steps, remaining, decayed, newly_decayed and, for
+adaptive runs, times_days) live in one multiprocessing.shared_memory
+segment that the worker writes into and the GUI reads as NumPy views, so
+nothing is pickled however long the run is.
+
+Ownership and cleanup:
+
+* The parent creates the segment (SharedRunBuffers.create) and is the only
+  process that unlinks it (release). The worker attaches by name and only
+  closes its own mapping, so a worker that crashes leaves nothing behind.
+* The worker writes rows first and then publishes them by storing the row
+  count in the segment header; the parent reads ``count`` and then only
+  rows below it.
+* Views handed out by ``columns`` keep the mapping alive, so an array can
+  never point at unmapped memory. The owner must drop its views (e.g.
+  replace the plotted data) before release(); closing a mapping that is
+  still viewed raises BufferError. A finalizer unlinks segments the
+  parent forgot when the interpreter exits.
+
+The worker runs the binomial engine, which draws the same per-step counts
+without keeping a decay log: the GUI only plots the series, and a log
+would cost memory the parent never reads.
+"""
+import time
+import weakref
+from multiprocessing import shared_memory
+import numpy as np
+
+from radioactive_decay_visualizer import RadioactiveDecaySimulator
+
+SERIES_COLUMNS = ("time_steps", "remaining", "decayed", "newly_decayed")
+# Engine the worker runs; a caller caching its results must key them by it
+WORKER_ENGINE = "binomial"
+# Header: published row count, then the capacity the segment was sized for
+_HEADER = np.dtype([('count', np.int64), ('capacity', np.int64)])
+
+
+def _layout(capacity, adaptive):
+    """[(name, dtype, byte offset)] of the columns after the header."""
+    columns = [(name, np.dtype(np.int64)) for name in SERIES_COLUMNS]
+    if adaptive:
+        columns.append(("times_days", np.dtype(np.float64)))
+    layout = []
+    offset = _HEADER.itemsize
+    for name, dtype in columns:
+        layout.append((name, dtype, offset))
+        offset += capacity * dtype.itemsize
+    return layout, offset
+
+
+def _unlink(shm):
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SharedRunBuffers:
+    """Fixed-capacity series columns in one shared-memory segment."""
+
+    def __init__(self, shm, capacity, adaptive, owner):
+        self._shm = shm
+        self.name = shm.name
+        self.capacity = capacity
+        self.adaptive = adaptive
+        self.owner = owner
+        layout, _ = _layout(capacity, adaptive)
+        # frombuffer holds an export on the mapping for as long as any view
+        # lives, so the segment cannot be unmapped from under an array
+        self._header = np.frombuffer(shm.buf, dtype=_HEADER, count=1)
+        self._columns = {name: np.frombuffer(shm.buf, dtype=dtype, count=capacity, offset=offset)
+                         for name, dtype, offset in layout}
+        self._filled = 0  # Rows written by this process, published or not
+        self._finalizer = weakref.finalize(self, _unlink, shm) if owner else None
+
+    @classmethod
+    def create(cls, capacity, adaptive=False):
+        """Allocate a segment for ``capacity`` rows; the caller owns it."""
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        _, size = _layout(capacity, adaptive)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        buffers = cls(shm, capacity, adaptive, owner=True)
+        buffers._header['count'] = 0
+        buffers._header['capacity'] = capacity
+        return buffers
+
+    @classmethod
+    def attach(cls, spec):
+        """Map the segment described by ``spec`` (see ``spec``) in a worker."""
+        shm = shared_memory.SharedMemory(name=spec["name"])
+        return cls(shm, spec["capacity"], spec["adaptive"], owner=False)
+
+    @property
+    def spec(self):
+        """Picklable description a worker attaches with."""
+        return {"name": self.name, "capacity": self.capacity, "adaptive": self.adaptive}
+
+    @property
+    def count(self):
+        """Rows the worker has published."""
+        return int(self._header['count'][0])
+
+    def append(self, step, remaining, decayed, newly_decayed, time_days=None):
+        """Write one row; it becomes visible to the reader at the next publish()."""
+        row = self._filled
+        if row >= self.capacity:
+            raise ValueError(f"Shared buffers hold only {self.capacity} rows.")
+        columns = self._columns
+        columns["time_steps"][row] = step
+        columns["remaining"][row] = remaining
+        columns["decayed"][row] = decayed
+        columns["newly_decayed"][row] = newly_decayed
+        if self.adaptive:
+            columns["times_days"][row] = time_days
+        self._filled = row + 1
+
+    def publish(self):
+        # The rows are in place before the count that exposes them
+        self._header['count'] = self._filled
+
+    def columns(self, start=0, stop=None):
+        """Read-only views of rows start..stop (default: all published rows)."""
+        stop = self.count if stop is None else stop
+        views = {}
+        for name, column in self._columns.items():
+            view = column[start:stop]
+            view.flags.writeable = False
+            views[name] = view
+        return views
+
+    def close(self):
+        """Unmap this process's view; the segment itself stays (see release).
+
+        Raises BufferError if views handed out by ``columns`` are still alive.
+        """
+        self._header = None
+        self._columns = {}
+        self._shm.close()
+
+    def release(self):
+        """Owner only: unlink and unmap; every view must be dropped first."""
+        if not self.owner:
+            raise ValueError("Only the process that created the buffers releases them.")
+        self._finalizer()
+        self.close()
+
+
+def run_worker(spec, num_atoms, half_life_value, half_life_unit, num_steps, adaptive,
+               messages, cancel_event, post_interval=0.016, seed=None):
+    """Worker-process entry point: simulate into the shared buffers.
+
+    Posts ('progress', step, count) at most every ``post_interval`` seconds
+    and ends with ('done', delta_t_days, count), ('cancelled', step,
+    delta_t_days, count) or ('error', exception). Only row counts travel
+    through ``messages``; the rows themselves are read from the segment.
+    """
+    buffers = None
+    try:
+        buffers = SharedRunBuffers.attach(spec)
+        # Optimization: the GUI never reads the decay log, so don't build one
+        simulator = RadioactiveDecaySimulator(engine=WORKER_ENGINE, seed=seed)
+        if adaptive:
+            delta_t_days, _ = simulator.calculate_step_size(half_life_value, half_life_unit, 50)
+            records = simulator.iter_adaptive(
+                num_atoms, half_life_value, half_life_unit, num_steps * delta_t_days)
+        else:
+            records = ((step, None, *rest) for step, *rest in simulator.iter_simulation(
+                num_atoms, half_life_value, half_life_unit, num_steps, 50))
+        last_post = 0.0
+        for step, time_days, left, total_decayed, newly_decayed in records:
+            buffers.append(step, left, total_decayed, newly_decayed, time_days)
+            if cancel_event.is_set():
+                records.close()
+                buffers.publish()
+                messages.put(('cancelled', step, simulator.delta_t_days, buffers.count))
+                return
+            now = time.monotonic()
+            if now - last_post >= post_interval:
+                last_post = now
+                buffers.publish()
+                messages.put(('progress', step, buffers.count))
+        buffers.publish()
+        messages.put(('done', simulator.delta_t_days, buffers.count))
+    except Exception as e:
+        messages.put(('error', e))
+    finally:
+        if buffers is not None:
+            buffers.close()
@@ -0,0 +1,177 @@
+"""Parameter sweeps over ISOTOPES x atom counts x step sizes.
+
+A grid spec expands into one job per combination. Jobs run on a process
+pool, largest estimated cost first, and each finished job streams its rows
+into a shard file next to a JSON manifest. Rerunning the same sweep into the
+same directory skips every job the manifest already records as done.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+from radioactive_decay_visualizer import (
+    ENGINES, ISOTOPES, RadioactiveDecaySimulator, write_atomically)
+
+MANIFEST_NAME = "manifest.json"
+
+# Columns of the tidy table, one row per (job, step)
+SWEEP_COLUMNS = ("job", "isotope", "num_atoms", "balanced_fraction",
+                 "step", "time_days", "remaining", "decayed")
+
+# Rough per-step cost of each engine relative to the number of atoms
+_ENGINE_ATOM_COST = {"python": 50.0, "numpy": 1.0, "event": 0.0, "binomial": 0.0}
+
+
+def expand_grid(spec):
+    """Expand a grid spec into a list of job dicts in a stable order.
+
+    ``spec`` keys: ``isotopes`` (list of names or "all"), ``atoms`` (list),
+    ``balanced_fractions`` (list, default [50]), ``steps`` (int),
+    ``engine`` (default "binomial") and ``seed`` (optional int).
+    """
+    isotopes = spec.get("isotopes", "all")
+    if isotopes == "all":
+        isotopes = [name for name, data in ISOTOPES.items()
+                    if data["half_life"] is not None]
+    engine = spec.get("engine", "binomial")
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Unknown engine '{engine}'. Choose from: {', '.join(ENGINES)}.")
+    num_steps = int(spec["steps"])
+
+    jobs = []
+    for isotope in isotopes:
+        if isotope not in ISOTOPES or ISOTOPES[isotope]["half_life"] is None:
+            raise ValueError(f"Isotope '{isotope}' has no half-life to sweep.")
+        for num_atoms in map(int, spec["atoms"]):
+            for fraction in spec.get("balanced_fractions", [50]):
+                jobs.append({
+                    "index": len(jobs),
+                    "id": f"{isotope}|atoms={num_atoms}|fraction={fraction!r}"
+                          f"|steps={num_steps}|engine={engine}",
+                    "isotope": isotope,
+                    "num_atoms": num_atoms,
+                    "balanced_fraction": float(fraction),
+                    "num_steps": num_steps,
+                    "engine": engine,
+                })
+    return jobs
+
+
+def estimate_cost(job):
+    """Relative cost used to schedule the biggest jobs first."""
+    num_atoms = job["num_atoms"]
+    cost = job["num_steps"] * (1.0 + _ENGINE_ATOM_COST[job["engine"]] * num_atoms)
+    if job["engine"] == "event":
+        cost += num_atoms * max(np.log2(num_atoms), 1.0)
+    return cost
+
+
+def _run_sweep_job(job, entropy):
+    """Run one job in a worker and return its rows as column arrays."""
+    seed = np.random.SeedSequence(entropy, spawn_key=(job["index"],))
+    isotope = ISOTOPES[job["isotope"]]
+    # Only the series is kept, so the engine runs without a decay log
+    simulator = RadioactiveDecaySimulator(engine=job["engine"], seed=seed, keep_decay_log=False)
+    chunks = list(simulator.iter_simulation(
+        job["num_atoms"], isotope["half_life"], isotope["unit"], job["num_steps"],
+        job["balanced_fraction"], chunk_size=4096))
+    records = np.concatenate(chunks)
+    rows = len(records)
+    return {
+        "job": np.full(rows, job["index"], dtype=np.int64),
+        "isotope": np.full(rows, job["isotope"]),
+        "num_atoms": np.full(rows, job["num_atoms"], dtype=np.int64),
+        "balanced_fraction": np.full(rows, job["balanced_fraction"]),
+        "step": records[:, 0],
+        "time_days": records[:, 0] * simulator.delta_t_days,
+        "remaining": records[:, 1],
+        "decayed": records[:, 2],
+    }
+
+
+def _write_json(path, data):
+    # Renamed into place so an interrupted sweep never leaves a half-written
+    # manifest behind
+    write_atomically(path, lambda f: json.dump(data, f, indent=2))
+
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def run_sweep(spec, output_dir, max_workers=None, progress=None):
+    """Run every job of ``spec`` not yet done in ``output_dir``.
+
+    Returns the manifest. ``progress`` is called as progress(job, manifest)
+    after each finished job.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Compare specs the way they come back from the manifest
+    spec = json.loads(json.dumps(spec))
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    jobs = expand_grid(spec)
+
+    manifest = load_manifest(output_dir)
+    if manifest is None:
+        # Unseeded sweeps fix their entropy here so a restart reproduces
+        # the same per-job streams
+        entropy = np.random.SeedSequence(spec.get("seed")).entropy
+        manifest = {"spec": spec, "entropy": str(entropy), "jobs": {}}
+        _write_json(manifest_path, manifest)
+    elif manifest["spec"] != spec:
+        raise ValueError(
+            f"{output_dir} holds a different sweep; use a new directory.")
+    entropy = int(manifest["entropy"])
+
+    pending = [job for job in jobs
+               if manifest["jobs"].get(job["id"], {}).get("status") != "done"]
+    pending.sort(key=estimate_cost, reverse=True)
+    if not pending:
+        return manifest
+
+    def record(job, columns):
+        shard = f"job-{job['index']:06d}.npz"
+        np.savez(os.path.join(output_dir, shard), **columns)
+        manifest["jobs"][job["id"]] = {
+            "status": "done", "index": job["index"], "shard": shard,
+            "rows": int(len(columns["step"])),
+        }
+        _write_json(manifest_path, manifest)
+        if progress is not None:
+            progress(job, manifest)
+
+    if max_workers == 1:
+        for job in pending:
+            record(job, _run_sweep_job(job, entropy))
+        return manifest
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # The pool starts tasks in submission order, so largest go first
+        futures = {executor.submit(_run_sweep_job, job, entropy): job
+                   for job in pending}
+        for future in as_completed(futures):
+            record(futures[future], future.result())
+    return manifest
+
+
+def load_sweep_table(output_dir):
+    """Concatenate the finished shards into one dict of column arrays."""
+    manifest = load_manifest(output_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No sweep manifest in {output_dir}")
+    shards = sorted((entry["index"], entry["shard"])
+                    for entry in manifest["jobs"].values()
+                    if entry["status"] == "done")
+    columns = {name: [] for name in SWEEP_COLUMNS}
+    for _, shard in shards:
+        with np.load(os.path.join(output_dir, shard)) as data:
+            for name in SWEEP_COLUMNS:
+                columns[name].append(data[name])
+    return {name: np.concatenate(parts) if parts else np.array([])
+            for name, parts in columns.items()}
@@ -0,0 +1,948 @@
+"""Tkinter front end for the radioactive decay simulator.
+
+Kept apart from radioactive_decay_visualizer so the simulation core and its
+CLI can run headless without importing tkinter or matplotlib.
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+import math
+import multiprocessing
+import queue
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+from radioactive_decay_visualizer import (
+    ISOTOPES, RadioactiveDecaySimulator, SimulationCache, minmax_decimate, to_days)
+from decay_shared import WORKER_ENGINE, SharedRunBuffers, run_worker
+
+# Set global plot styles for the dark theme
+plt.rcParams['figure.facecolor'] = '#0A0E27'
+plt.rcParams['axes.facecolor'] = '#0D1B2A'
+plt.rcParams['text.color'] = '#FFFFFF'
+plt.rcParams['axes.labelcolor'] = '#FFFFFF'
+plt.rcParams['xtick.color'] = '#FFFFFF'
+plt.rcParams['ytick.color'] = '#FFFFFF'
+
+
+class ModernButton(tk.Canvas):
+    def __init__(self, parent, text, command, bg_color="#00FF41", hover_color="#00CC33", **kwargs):
+        super().__init__(parent, height=45,
+                         bg=parent['bg'], highlightthickness=0, **kwargs)
+        self.command = command
+        self.bg_color = bg_color
+        self.hover_color = hover_color
+        self.text = text
+        self.bind("<Configure>", lambda e: self.draw_button(self.bg_color))
+        self.draw_button(bg_color)
+        self.bind("<Enter>", lambda e: self.on_hover())
+        self.bind("<Leave>", lambda e: self.on_leave())
+        self.bind("<Button-1>", lambda e: self.on_click())
+
+    def draw_button(self, color):
+        self.delete("all")
+        width = self.winfo_width() or 200
+        height = 45
+        self.create_rounded_rect(
+            2, 2, width-2, height-2, radius=12, fill=color, outline="")
+        self.create_text(width//2, height//2, text=self.text,
+                         fill="#0A0E27", font=("Segoe UI", 11, "bold"))
+
+    def create_rounded_rect(self, x1, y1, x2, y2, radius=25, **kwargs):
+        points = [x1+radius, y1, x2-radius, y1, x2, y1, x2, y1+radius,
+                  x2, y2-radius, x2, y2, x2-radius, y2, x1+radius, y2,
+                  x1, y2, x1, y2-radius, x1, y1+radius, x1, y1]
+        return self.create_polygon(points, smooth=True, **kwargs)
+
+    def on_hover(self):
+        self.draw_button(self.hover_color)
+
+    def on_leave(self):
+        self.draw_button(self.bg_color)
+
+    def on_click(self):
+        if self.command:
+            self.command()
+
+
+class DecayVisualizerApp:
+    # ~60 fps for queue polling; progress is posted at most this often too
+    POLL_INTERVAL_MS = 16
+    # Above this many steps the per-step bars become a decimated step line
+    MAX_BARS = 500
+    # Decimation buckets to use before the canvas has a size
+    DEFAULT_BUCKETS = 1000
+    # Width of the analytic band drawn around the expected curves
+    EXPECTED_SIGMAS = 3
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Radioactive Decay Visualizer (Physics Mode)")
+        self.root.geometry("1400x900")
+
+        self.colors = {
+            'bg': '#0A0E27',
+            'panel1': '#1A0B2E',
+            'panel2': '#16213E',
+            'panel3': '#0F3460',
+            'accent': '#00FF41',
+            'success': '#39FF14',
+            'danger': '#FF006E',
+            'warning': '#FFFF00',
+            'info': '#00D9FF',
+            'text': '#FFFFFF',
+            'text_neon': '#00FF41',
+            'border_neon': '#FF006E',
+            'glow': '#8A2BE2'
+        }
+
+        self.root.configure(bg=self.colors['bg'])
+        # Seeded reruns of the same isotope/atoms/steps come straight from the
+        # cache. The worker's engine, so cached runs are keyed by what produced them
+        self.simulator = RadioactiveDecaySimulator(engine=WORKER_ENGINE, cache=SimulationCache())
+        # Background run state: a worker process writes the series into
+        # shared memory and posts row counts to sim_queue, which the Tk loop
+        # drains with root.after. Spawned, not forked, so the child does not
+        # inherit Tk.
+        self.mp_context = multiprocessing.get_context("spawn")
+        self.sim_queue = None
+        self.sim_process = None
+        self.cancel_event = None
+        # Shared buffers are owned by the app (see decay_shared): those of
+        # the run in flight, and those whose views are on the plot, which
+        # are released once a newer run replaces them or the window closes
+        self.sim_buffers = None
+        self.shown_buffers = None
+        self.sim_run = None  # Parameters of the run in flight
+        self.streamed_rows = 0  # Rows of sim_buffers already on the live plot
+        self.setup_styles()
+        self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def setup_styles(self):
+        style = ttk.Style()
+        try:
+            style.theme_use('clam')
+        except Exception:
+            pass
+
+        style.configure(
+            'Card.TFrame', background=self.colors['panel1'], relief='flat', borderwidth=0)
+        style.configure('Main.TFrame', background=self.colors['bg'])
+        style.configure('Title.TLabel', background=self.colors['panel1'], foreground=self.colors['text'], font=(
+            'Segoe UI', 11, 'bold'))
+        style.configure('Header.TLabel', background=self.colors['bg'], foreground=self.colors['text'], font=(
+            'Segoe UI', 16, 'bold'))
+        style.configure(
+            'Subtitle.TLabel', background=self.colors['panel1'], foreground=self.colors['info'], font=('Segoe UI', 9))
+
+        style.configure('Modern.TEntry', fieldbackground='#1E2749',
+                        foreground='#FFFFFF', borderwidth=2, insertcolor='#00FF41')
+        style.map('Modern.TEntry', fieldbackground=[
+                  ('readonly', '#2A3654')], foreground=[('readonly', '#AAAAAA')])
+
+        style.configure('Modern.TCombobox', fieldbackground='#1E2749',
+                        foreground='#FFFFFF', borderwidth=2, arrowcolor='#00FF41')
+        style.map('Modern.TCombobox', fieldbackground=[
+                  ('readonly', '#1E2749')], selectbackground=[('readonly', '#0F3460')])
+
+    def create_card(self, parent, title=None, panel_color='panel1'):
+        card = tk.Frame(
+            parent, bg=self.colors[panel_color], relief='flat', borderwidth=0)
+        card.configure(highlightbackground=self.colors['border_neon'],
+                       highlightthickness=2, highlightcolor=self.colors['accent'])
+        if title:
+            title_label = tk.Label(card, text=title, bg=self.colors[panel_color], fg=self.colors['text_neon'], font=(
+                'Segoe UI', 13, 'bold'), anchor='w')
+            title_label.pack(fill='x', padx=20, pady=(15, 10))
+        return card
+
+    def setup_ui(self):
+        main_container = tk.Frame(self.root, bg=self.colors['bg'])
+        main_container.pack(fill='both', expand=True, padx=20, pady=20)
+
+        header_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        header_frame.pack(fill='x', pady=(0, 15))
+
+        title = tk.Label(header_frame, text="☢ RADIOACTIVE DECAY SIMULATOR (PHYSICS)",
+                         bg=self.colors['bg'], fg=self.colors['accent'], font=('Segoe UI', 20, 'bold'))
+        title.pack(anchor='w')
+
+        subtitle = tk.Label(header_frame, text="Real half-life based simulation — 'Balanced' step size: Δt = T₁/₂ / 50",
+                            bg=self.colors['bg'], fg=self.colors['info'], font=('Segoe UI', 10))
+        subtitle.pack(anchor='w', pady=(5, 0))
+
+        content = tk.Frame(main_container, bg=self.colors['bg'])
+        content.pack(fill='both', expand=True)
+
+        left_column = tk.Frame(content, bg=self.colors['bg'])
+        left_column.pack(side='left', fill='both', padx=(0, 10))
+        self.setup_controls(left_column)
+
+        right_column = tk.Frame(content, bg=self.colors['bg'])
+        right_column.pack(side='left', fill='both', expand=True)
+        self.setup_visualization(right_column)
+
+    def setup_controls(self, parent):
+        params_card = self.create_card(
+            parent, "SIMULATION PARAMETERS", 'panel1')
+        params_card.pack(fill='x', pady=(0, 15))
+
+        params_content = tk.Frame(params_card, bg=self.colors['panel1'])
+        params_content.pack(fill='x', padx=20, pady=(0, 20))
+
+        self.create_input_row(
+            params_content, "Select Isotope", 0, is_combobox=True)
+
+        self.rec_label = tk.Label(params_content, text="", bg=self.colors['panel1'], fg=self.colors['warning'], font=(
+            'Segoe UI', 8, 'italic'), justify='left')
+        self.rec_label.pack(fill='x', pady=(0, 10))
+
+        self.create_input_row(params_content, "Half-life", 1)
+        self.create_input_row(
+            params_content, "Number of Atoms", 2, default="1000")
+        self.create_input_row(
+            params_content, "Simulation Steps", 3, default="50")
+        # Blank draws a new sample each run; a seed makes runs repeatable,
+        # so only those are served from the cache
+        self.create_input_row(params_content, "Seed (optional)", 4)
+
+        # Adaptive runs cover the same time span with fewer, larger steps
+        self.adaptive_var = tk.BooleanVar(value=False)
+        adaptive_check = tk.Checkbutton(
+            params_content, text="Adaptive Δt (same span, steps sized by expected decays)",
+            variable=self.adaptive_var, bg=self.colors['panel1'], fg=self.colors['info'],
+            selectcolor=self.colors['panel3'], activebackground=self.colors['panel1'],
+            activeforeground=self.colors['accent'], font=('Segoe UI', 9), anchor='w')
+        adaptive_check.pack(fill='x')
+
+        button_frame = tk.Frame(params_card, bg=self.colors['panel1'])
+        button_frame.pack(fill='x', padx=20, pady=(10, 20))
+        run_btn = ModernButton(button_frame, "▶ RUN SIMULATION", self.run_simulation,
+                               bg_color=self.colors['accent'], hover_color=self.colors['success'], width=300)
+        run_btn.pack()
+        cancel_btn = ModernButton(button_frame, "■ CANCEL", self.cancel_simulation,
+                                  bg_color=self.colors['danger'], hover_color=self.colors['glow'], width=300)
+        cancel_btn.pack(pady=(10, 0))
+        self.status_label = tk.Label(button_frame, text="Ready", bg=self.colors['panel1'], fg=self.colors['info'], font=(
+            'Segoe UI', 9, 'italic'))
+        self.status_label.pack(pady=(10, 0))
+
+        info_card = self.create_card(parent, "QUICK INFO", 'panel2')
+        info_card.pack(fill='both', expand=True)
+        info_content = tk.Frame(info_card, bg=self.colors['panel2'])
+        info_content.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+
+        info_text = (
+            "📚 About Half-Life:\n"
+            "The time required for half of the radioactive atoms to decay.\n\n"
+            "🔬 How it works (physics mode):\n"
+            "We use the exponential decay law. Each step simulates Δt = T₁/₂ / 50\n"
+            "so the decay probability per step is P = 1 - exp(-ln2 * Δt / T₁/₂).\n\n"
+        )
+        info_label = tk.Label(info_content, text=info_text, bg=self.colors['panel2'], fg=self.colors['text'], font=(
+            'Segoe UI', 9), justify='left', anchor='nw')
+        info_label.pack(fill='both', expand=True)
+
+    def create_input_row(self, parent, label_text, row, is_combobox=False, default=""):
+        row_frame = tk.Frame(parent, bg=self.colors['panel1'])
+        row_frame.pack(fill='x', pady=10)
+
+        label = tk.Label(row_frame, text=label_text, bg=self.colors['panel1'], fg=self.colors['info'], font=(
+            'Segoe UI', 10, 'bold'), anchor='w', width=18)
+        label.pack(side='left')
+
+        if is_combobox and label_text == "Select Isotope":
+            self.isotope_var = tk.StringVar()
+            combo = ttk.Combobox(row_frame, textvariable=self.isotope_var, values=list(
+                ISOTOPES.keys()), width=25, state="readonly", font=('Segoe UI', 10), style='Modern.TCombobox')
+            combo.pack(side='left', fill='x', expand=True)
+            combo.current(0)
+            combo.bind("<<ComboboxSelected>>", self.on_isotope_selected)
+            # FIX: Initialize the display on startup
+            self.root.after(100, lambda: self.on_isotope_selected(None))
+        elif label_text == "Half-life":
+            input_frame = tk.Frame(row_frame, bg=self.colors['panel1'])
+            input_frame.pack(side='left', fill='x', expand=True)
+            first_key = list(ISOTOPES.keys())[0]
+            default_val = ISOTOPES[first_key]["half_life"] if ISOTOPES[first_key]["half_life"] is not None else ""
+            self.halflife_var = tk.StringVar(value=str(default_val))
+            self.halflife_entry = ttk.Entry(input_frame, textvariable=self.halflife_var, width=15, font=(
+                'Segoe UI', 10), style='Modern.TEntry', state='readonly')
+            self.halflife_entry.pack(side='left', padx=(0, 5))
+            self.halflife_unit_label = tk.Label(
+                input_frame, text="", bg=self.colors['panel1'], fg=self.colors['warning'], font=('Segoe UI', 9, 'bold'))
+            self.halflife_unit_label.pack(side='left')
+        else:
+            var = tk.StringVar(value=default)
+            if label_text == "Number of Atoms":
+                self.atoms_var = var
+            elif label_text == "Simulation Steps":
+                self.steps_var = var
+            elif label_text == "Seed (optional)":
+                self.seed_var = var
+            entry = ttk.Entry(row_frame, textvariable=var, width=25, font=(
+                'Segoe UI', 10), style='Modern.TEntry')
+            entry.pack(side='left', fill='x', expand=True)
+
+    def setup_visualization(self, parent):
+        stats_frame = tk.Frame(parent, bg=self.colors['bg'])
+        stats_frame.pack(fill='x', pady=(0, 15))
+
+        self.stats_cards = {}
+        stats_info = [
+            ("REMAINING", "atoms_remaining", self.colors['success'], 'panel1'),
+            ("DECAYED", "atoms_decayed", self.colors['danger'], 'panel2'),
+            ("PROGRESS", "decay_percent", self.colors['info'], 'panel3')
+        ]
+
+        for i, (title, key, color, panel) in enumerate(stats_info):
+            card = self.create_stat_card(stats_frame, title, "—", color, panel)
+            card.pack(side='left', fill='x', expand=True,
+                      padx=(0, 10 if i < 2 else 0))
+            self.stats_cards[key] = card
+
+        viz_card = self.create_card(parent, "DECAY VISUALIZATION", 'panel3')
+        viz_card.pack(fill='both', expand=True)
+        viz_content = tk.Frame(viz_card, bg=self.colors['panel3'])
+        viz_content.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+
+        self.figure = Figure(figsize=(10, 6), dpi=100,
+                             facecolor=self.colors['panel3'])
+        self.canvas = FigureCanvasTkAgg(self.figure, master=viz_content)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+        # Persistent plot artists, built on the first run and then updated in place
+        self.plot_artists = None
+        # Full-resolution series of the last run, kept for re-decimation on zoom
+        self.plot_data = None
+        # Closed-form expected curves (run_analytic output) for the current run
+        self.expected_data = None
+        # Live-streaming state while a run is in progress (None otherwise)
+        self.live_plot = None
+        self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
+        self.draw_empty_plot()
+
+    def create_stat_card(self, parent, title, value, color, panel_color):
+        card = tk.Frame(parent, bg=self.colors[panel_color], relief='flat',
+                        highlightbackground=color, highlightthickness=3)
+        content = tk.Frame(card, bg=self.colors[panel_color])
+        content.pack(fill='both', expand=True, padx=20, pady=15)
+        title_label = tk.Label(
+            content, text=title, bg=self.colors[panel_color], fg=self.colors['text'], font=('Segoe UI', 9, 'bold'))
+        title_label.pack(anchor='w')
+        value_label = tk.Label(
+            content, text=value, bg=self.colors[panel_color], fg=color, font=('Segoe UI', 22, 'bold'))
+        value_label.pack(anchor='w', pady=(5, 0))
+        card.value_label = value_label
+        return card
+
+    def draw_empty_plot(self):
+        self.figure.clear()
+        self.plot_artists = None
+        self.plot_data = None
+        self.expected_data = None
+        ax = self.figure.add_subplot(111, facecolor=self.colors['panel3'])
+        ax.text(0.5, 0.5, '▶ RUN A SIMULATION TO SEE RESULTS', ha='center', va='center',
+                fontsize=14, color=self.colors['accent'], transform=ax.transAxes, weight='bold')
+        ax.set_xticks([])
+        ax.set_yticks([])
+        for spine in ax.spines.values():
+            spine.set_color(self.colors['border_neon'])
+            spine.set_linewidth(2)
+        self.canvas.draw()
+
+    def on_isotope_selected(self, event):
+        selected = self.isotope_var.get()
+        isotope_data = ISOTOPES[selected]
+        if selected == "Custom":
+            self.halflife_entry.config(state="normal")
+            self.halflife_var.set("")
+            self.halflife_unit_label.config(text=isotope_data["unit"])
+            self.rec_label.config(text="")
+        else:
+            self.halflife_entry.config(state="readonly")
+            half_life = isotope_data["half_life"]
+            if half_life >= 1e6 or half_life < 0.01:
+                display_value = f"{half_life:.3e}"
+            elif half_life >= 1000:
+                display_value = f"{half_life:,.0f}"
+            else:
+                display_value = f"{half_life:.2f}"
+            self.halflife_var.set(display_value)
+            self.halflife_unit_label.config(text=isotope_data["unit"])
+
+            half_life_days = to_days(
+                isotope_data["half_life"], isotope_data["unit"])
+            if half_life_days:
+                delta_t_days = half_life_days / 50.0
+                if delta_t_days >= 365.25:
+                    delta_display = f"{delta_t_days/365.25:.2f} years/step"
+                elif delta_t_days >= 1:
+                    delta_display = f"{delta_t_days:.2f} days/step"
+                elif delta_t_days >= 1 / 24:
+                    delta_display = f"{delta_t_days*24:.2f} hours/step"
+                else:
+                    delta_display = f"{delta_t_days*86400:.3g} seconds/step"
+                self.rec_label.config(
+                    text=f"✓ Balanced Δt ≈ {delta_display} (Δt = T₁/₂ / 50)")
+            else:
+                self.rec_label.config(text="")
+
+    def run_simulation(self):
+        try:
+            num_atoms = int(self.atoms_var.get())
+            num_steps = int(self.steps_var.get())
+            seed_str = self.seed_var.get().strip()
+            self.simulator.seed = int(seed_str) if seed_str else None
+            selected = self.isotope_var.get()
+            isot = ISOTOPES[selected]
+
+            if selected == "Custom":
+                half_life_str = self.halflife_var.get().replace(',', '').strip()
+                if half_life_str == "":
+                    messagebox.showerror(
+                        "Invalid Input", "Enter a half-life for Custom isotope.")
+                    return
+                # FIX: Validate that custom half-life is positive
+                half_life_value = float(half_life_str)
+                if half_life_value <= 0:
+                    messagebox.showerror(
+                        "Invalid Input", "Half-life must be a positive number!")
+                    return
+                half_life_unit = isot["unit"]
+            else:
+                half_life_value = isot["half_life"]
+                half_life_unit = isot["unit"]
+
+            if num_atoms <= 0 or num_steps <= 0:
+                messagebox.showerror(
+                    "Invalid Input", "All values must be positive numbers!")
+                return
+
+            if self.sim_process is not None and self.sim_process.is_alive():
+                self.status_label.config(text="A simulation is already running")
+                return
+
+            # The analytic curve needs no sampling, so it is on screen before
+            # the first Monte Carlo step comes back
+            self.expected_data = self.simulator.run_analytic(
+                num_atoms, half_life_value, half_life_unit, num_steps,
+                balanced_fraction=50, k_sigma=self.EXPECTED_SIGMAS)
+            delta_t_days = self.expected_data['delta_t_days']
+            self.begin_live_plot(num_atoms, num_steps, delta_t_days,
+                                 self.expected_data['decayed'][1] / num_atoms if num_steps else 0)
+
+            adaptive = self.adaptive_var.get()
+            run_args = (num_atoms, half_life_value, half_life_unit, num_steps, 50)
+            cached = None if adaptive else self.simulator.get_cached_run(*run_args)
+            if cached is not None:
+                self.end_live_plot()
+                time_steps, remaining, decayed, delta_t_days = cached
+                self._show_run(time_steps, remaining, decayed, delta_t_days, num_atoms)
+                self._replace_shown_buffers(None)
+                self.status_label.config(text="Done")
+                return
+            self.start_worker(run_args, adaptive)
+
+        except ValueError as e:
+            messagebox.showerror(
+                "Invalid Input", f"Please enter valid numeric values!\nError: {str(e)}")
+        except Exception as e:
+            messagebox.showerror(
+                "Simulation Error", f"An error occurred during simulation:\n{str(e)}")
+
+    def start_worker(self, run_args, adaptive):
+        """Run the simulation in a worker process writing into shared buffers."""
+        num_atoms, half_life_value, half_life_unit, num_steps, _ = run_args
+        if adaptive:
+            # A fine tolerance takes steps shorter than the balanced Δt, so
+            # size the buffers from the bound on the step count, not num_steps
+            max_steps = self.simulator.max_adaptive_steps(
+                half_life_value, half_life_unit,
+                num_steps * self.expected_data['delta_t_days'])
+        else:
+            max_steps = num_steps
+        self.sim_buffers = SharedRunBuffers.create(max_steps + 1, adaptive)
+        self.sim_queue = self.mp_context.Queue()
+        self.cancel_event = self.mp_context.Event()
+        self.sim_run = {'args': run_args, 'adaptive': adaptive,
+                        'delta_t_days': self.expected_data['delta_t_days']}
+        self.streamed_rows = 0
+        self.sim_process = self.mp_context.Process(
+            target=run_worker,
+            args=(self.sim_buffers.spec, num_atoms, half_life_value, half_life_unit,
+                  num_steps, adaptive, self.sim_queue, self.cancel_event,
+                  self.POLL_INTERVAL_MS / 1000.0, self.simulator.seed),
+            daemon=True)
+        self.sim_process.start()
+        self.status_label.config(text="Running…")
+        self.root.after(self.POLL_INTERVAL_MS, self._poll_simulation)
+
+    def _replace_shown_buffers(self, buffers):
+        # The plot no longer refers to the old segment, so it unmaps at once
+        if self.shown_buffers is not None:
+            self.shown_buffers.release()
+        self.shown_buffers = buffers
+
+    def _poll_simulation(self):
+        # Checked before draining: a worker that has exited has already
+        # queued everything it will ever post
+        alive = self.sim_process.is_alive()
+        latest_progress = None
+        finished = None
+        try:
+            while True:
+                message = self.sim_queue.get_nowait()
+                if message[0] == 'progress':
+                    latest_progress = message
+                else:
+                    finished = message
+        except queue.Empty:
+            pass
+        if finished is None and not alive:
+            finished = ('error', RuntimeError(
+                f"The simulation process exited with code {self.sim_process.exitcode}."))
+
+        num_atoms, _, _, num_steps, _ = self.sim_run['args']
+        # Only the newest progress message matters for the readout
+        if latest_progress is not None and finished is None:
+            _, step, count = latest_progress
+            # Read-only views of every row so far; nothing is copied
+            rows = self.sim_buffers.columns(0, count)
+            self.update_stats(int(rows['remaining'][-1]), int(rows['decayed'][-1]), num_atoms)
+            if self.sim_run['adaptive']:
+                self.status_label.config(text=f"Running… adaptive step {step:,}")
+                # Adaptive times are in days rather than balanced steps
+                times = rows['times_days']
+                days = self.sim_run['delta_t_days']
+            else:
+                self.status_label.config(
+                    text=f"Running… step {step:,} / {num_steps:,}")
+                times = rows['time_steps']
+                days = 1.0
+            self.stream_decay(times, rows['remaining'], rows['decayed'],
+                              rows['newly_decayed'], self.streamed_rows, step_units=days)
+            self.streamed_rows = count
+
+        if finished is None:
+            self.root.after(self.POLL_INTERVAL_MS, self._poll_simulation)
+            return
+
+        self.end_live_plot()
+        self.sim_process.join()
+        kind = finished[0]
+        if kind in ('done', 'cancelled'):
+            delta_t_days, count = finished[-2:]
+            # Views straight into the shared segment; nothing is copied
+            rows = self.sim_buffers.columns(0, count)
+            self._show_run(rows['time_steps'], rows['remaining'], rows['decayed'],
+                           delta_t_days, num_atoms, rows.get('times_days'))
+            self._replace_shown_buffers(self.sim_buffers)
+            self.sim_buffers = None
+            if kind == 'done':
+                if not self.sim_run['adaptive']:
+                    self._cache_shared_run(rows, delta_t_days)
+                self.status_label.config(text="Done")
+            else:
+                self.status_label.config(
+                    text=f"Cancelled at step {finished[1]:,} / {num_steps:,}")
+        else:
+            e = finished[1]
+            self.sim_buffers.release()
+            self.sim_buffers = None
+            self.status_label.config(text="Error")
+            if isinstance(e, ValueError):
+                messagebox.showerror(
+                    "Invalid Input", f"Please enter valid numeric values!\nError: {str(e)}")
+            else:
+                messagebox.showerror(
+                    "Simulation Error", f"An error occurred during simulation:\n{str(e)}")
+
+    def _show_run(self, time_steps, remaining, decayed, delta_t_days, num_atoms, times_days=None):
+        self.update_stats(remaining[-1], decayed[-1], num_atoms)
+        self.visualize_decay(time_steps, remaining, decayed, delta_t_days, times_days)
+
+    def _cache_shared_run(self, rows, delta_t_days):
+        # The cache keeps its own copy, so the segment can be freed later
+        simulator = self.simulator
+        simulator.time_steps = rows['time_steps'].copy()
+        simulator.remaining_atoms = rows['remaining'].copy()
+        simulator.decayed_atoms = rows['decayed'].copy()
+        simulator.delta_t_days = delta_t_days
+        simulator.decay_list = None  # The per-atom log stayed in the worker
+        simulator.cache_run(*self.sim_run['args'])
+
+    def cancel_simulation(self):
+        if self.sim_process is not None and self.sim_process.is_alive():
+            self.cancel_event.set()
+            self.status_label.config(text="Cancelling…")
+
+    def on_close(self):
+        """Stop a running worker and free the shared buffers before the window goes."""
+        if self.sim_process is not None and self.sim_process.is_alive():
+            self.cancel_event.set()
+            self.sim_process.join(timeout=1.0)
+            if self.sim_process.is_alive():
+                self.sim_process.terminate()
+                self.sim_process.join()
+        # Drop the plotted views first, so the segments unmap as they are released
+        self.plot_data = None
+        self.figure.clear()
+        for buffers in (self.sim_buffers, self.shown_buffers):
+            if buffers is not None:
+                buffers.release()
+        self.sim_buffers = self.shown_buffers = None
+        self.root.destroy()
+
+    def update_stats(self, remaining, decayed, total):
+        self.stats_cards['atoms_remaining'].value_label.config(
+            text=f"{remaining:,}")
+        self.stats_cards['atoms_decayed'].value_label.config(
+            text=f"{decayed:,}")
+        decay_percent = (decayed/total)*100 if total > 0 else 0
+        self.stats_cards['decay_percent'].value_label.config(
+            text=f"{decay_percent:.1f}%")
+
+    @staticmethod
+    def _time_scale(max_days):
+        """Pick the display unit for a run lasting max_days; returns (days per unit, unit)."""
+        if max_days >= 365.25:
+            return 365.25, "years"
+        elif max_days >= 1:
+            return 1.0, "days"
+        elif max_days >= 1 / 24:
+            return 1.0 / 24, "hours"
+        return 1.0 / 86400, "seconds"
+
+    @staticmethod
+    def _set_fill(poly, x, y):
+        """Reshape a fill_between polygon to cover 0..y over x."""
+        if len(x) == 0:
+            poly.set_verts([np.zeros((0, 2))])
+            return
+        verts = np.empty((len(x) + 2, 2))
+        verts[0] = (x[0], 0)
+        verts[1:-1, 0] = x
+        verts[1:-1, 1] = y
+        verts[-1] = (x[-1], 0)
+        poly.set_verts([verts])
+
+    def _ensure_plot_artists(self):
+        """Build the axes and their artists once; later runs update them in place."""
+        if self.plot_artists is not None:
+            return self.plot_artists
+
+        self.figure.clear()
+        ax1 = self.figure.add_subplot(2, 1, 1, facecolor=self.colors['panel3'])
+        ax2 = self.figure.add_subplot(2, 1, 2, facecolor=self.colors['panel3'])
+
+        remaining_line, = ax1.plot([], [], linewidth=3, label='Remaining Atoms', color=self.colors['success'],
+                                   marker='o', markersize=5, alpha=0.9)
+        decayed_line, = ax1.plot([], [], linewidth=3, label='Decayed Atoms', color=self.colors['danger'],
+                                 marker='s', markersize=5, alpha=0.9)
+
+        remaining_fill = ax1.fill_between([0, 0], [0, 0], alpha=0.3,
+                                          color=self.colors['success'])
+        decayed_fill = ax1.fill_between([0, 0], [0, 0], alpha=0.3,
+                                        color=self.colors['danger'])
+
+        expected_remaining_line, = ax1.plot([], [], linewidth=1.5, linestyle='--', label='Expected (analytic)',
+                                            color=self.colors['text'], alpha=0.9)
+        expected_decayed_line, = ax1.plot([], [], linewidth=1.5, linestyle='--',
+                                          color=self.colors['text'], alpha=0.9)
+        remaining_band = ax1.fill_between([0, 0], [0, 0], alpha=0.15, color=self.colors['info'],
+                                          label=f'±{self.EXPECTED_SIGMAS}σ band')
+        decayed_band = ax1.fill_between([0, 0], [0, 0], alpha=0.15,
+                                        color=self.colors['info'])
+
+        ax1.set_xlabel('Time', fontsize=10, weight='bold')
+        ax1.set_ylabel('Number of Atoms', fontsize=10, weight='bold')
+        ax1.set_title('Radioactive Decay Over Time (Physics-based)',
+                      fontsize=12, fontweight='bold', color=self.colors['accent'], pad=15)
+        ax1.legend(loc='best', frameon=True, shadow=False, fontsize=9,
+                   facecolor=self.colors['panel3'], edgecolor=self.colors['border_neon'], labelcolor='white')
+        ax1.grid(True, alpha=0.3, linestyle='--', color=self.colors['info'])
+        for spine in ax1.spines.values():
+            spine.set_color(self.colors['border_neon'])
+            spine.set_linewidth(1.5)
+
+        # Per-step decays are drawn as this line while a run streams in and
+        # as bars once it has finished
+        rate_line, = ax2.plot([], [], linewidth=1.5, color=self.colors['warning'],
+                              drawstyle='steps-mid', visible=False)
+
+        ax2.set_xlabel('Time', fontsize=10, weight='bold')
+        ax2.set_ylabel('Atoms Decayed', fontsize=10, weight='bold')
+        ax2.set_title('Decay Rate per Time Step', fontsize=12,
+                      fontweight='bold', color=self.colors['warning'], pad=15)
+        ax2.grid(True, alpha=0.3, axis='y',
+                 linestyle='--', color=self.colors['info'])
+        for spine in ax2.spines.values():
+            spine.set_color(self.colors['border_neon'])
+            spine.set_linewidth(1.5)
+
+        # Zooming or panning re-decimates the series for the visible window
+        ax1.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        ax2.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+        self.figure.tight_layout()
+        self.plot_artists = {
+            'ax1': ax1, 'ax2': ax2,
+            'remaining_line': remaining_line, 'decayed_line': decayed_line,
+            'remaining_fill': remaining_fill, 'decayed_fill': decayed_fill,
+            'rate_line': rate_line, 'bars': None,
+            'expected_remaining_line': expected_remaining_line,
+            'expected_decayed_line': expected_decayed_line,
+            'remaining_band': remaining_band, 'decayed_band': decayed_band,
+        }
+        return self.plot_artists
+
+    def _decimate_axis(self, ax, xlim=None):
+        """Push the full-resolution series of one axis through minmax_decimate.
+
+        Only the points inside xlim (plus one neighbour on each side) are
+        considered, so the visible window is always drawn at pixel detail.
+        """
+        data = self.plot_data
+        artists = self.plot_artists
+        x = data['x']
+        lo, hi = 0, len(x)
+        if xlim is not None:
+            lo = max(int(np.searchsorted(x, xlim[0])) - 1, 0)
+            hi = min(int(np.searchsorted(x, xlim[1], side='right')) + 1, len(x))
+        num_buckets = ax.bbox.width or self.DEFAULT_BUCKETS
+
+        if ax is artists['ax1']:
+            for key in ('remaining', 'decayed'):
+                xd, yd = minmax_decimate(x[lo:hi], data[key][lo:hi], num_buckets)
+                # Only plot_data may view the shared buffers (they are released
+                # once it is replaced), so artists get their own copy
+                yd = np.array(yd)
+                line = artists[key + '_line']
+                line.set_data(xd, yd)
+                line.set_markevery(max(1, len(xd)//20))
+                self._set_fill(artists[key + '_fill'], xd, yd)
+            self._draw_expected(data['days_per_unit'], xlim)
+        elif data['as_line']:
+            xd, yd = minmax_decimate(x[lo:hi], data['rate'][lo:hi], num_buckets)
+            artists['rate_line'].set_data(xd, yd)
+
+    def _draw_expected(self, days_per_unit, xlim=None):
+        """Show the analytic curves and bands in the current time unit."""
+        artists = self.plot_artists
+        expected = self.expected_data
+        keys = ('expected_remaining_line', 'expected_decayed_line',
+                'remaining_band', 'decayed_band')
+        for key in keys:
+            artists[key].set_visible(expected is not None)
+        if expected is None:
+            return
+
+        x = expected['time_steps'] * (expected['delta_t_days'] / days_per_unit)
+        lo, hi = 0, len(x)
+        if xlim is not None:
+            lo = max(int(np.searchsorted(x, xlim[0])) - 1, 0)
+            hi = min(int(np.searchsorted(x, xlim[1], side='right')) + 1, len(x))
+        x = x[lo:hi]
+        num_buckets = artists['ax1'].bbox.width or self.DEFAULT_BUCKETS
+
+        for key in ('remaining', 'decayed'):
+            artists['expected_' + key + '_line'].set_data(
+                *minmax_decimate(x, expected[key][lo:hi], num_buckets))
+            low, high = expected[key + '_band']
+            x_high, y_high = minmax_decimate(x, high[lo:hi], num_buckets)
+            x_low, y_low = minmax_decimate(x, low[lo:hi], num_buckets)
+            verts = np.column_stack((np.concatenate((x_high, x_low[::-1])),
+                                     np.concatenate((y_high, y_low[::-1]))))
+            artists[key + '_band'].set_verts([verts])
+
+    def _on_xlim_changed(self, ax):
+        if self.plot_data is None or self.live_plot is not None:
+            return
+        self._decimate_axis(ax, ax.get_xlim())
+        self.canvas.draw_idle()
+
+    def _update_bars(self, real_times, decay_per_step):
+        artists = self.plot_artists
+        ax2 = artists['ax2']
+
+        # Calculate proper width for bars based on data range; adaptive runs
+        # have non-uniform steps, so each bar gets its own step's width
+        if len(real_times) > 1:
+            bar_width = np.diff(real_times, prepend=2 * real_times[0] - real_times[1]) * 0.8
+        else:
+            bar_width = np.ones(len(real_times))
+
+        bars = artists['bars']
+        if bars is not None and len(bars) == len(real_times):
+            # Optimization: same number of steps, so move the existing bars
+            for rect, x, width, height in zip(bars, real_times, bar_width, decay_per_step):
+                rect.set_x(x - width / 2)
+                rect.set_width(width)
+                rect.set_height(height)
+                rect.set_visible(True)
+            return
+
+        if bars is not None:
+            bars.remove()
+        artists['bars'] = ax2.bar(real_times, decay_per_step, width=bar_width, alpha=0.8,
+                                  color=self.colors['warning'], edgecolor=self.colors['accent'], linewidth=1.5)
+
+    def visualize_decay(self, time_steps, remaining, decayed, delta_t_days, times_days=None):
+        """Plot a finished run; ``times_days`` gives non-uniform step times (adaptive runs)."""
+        time_steps = np.asarray(time_steps, dtype=float)
+        remaining = np.asarray(remaining)
+        decayed = np.asarray(decayed)
+
+        if times_days is None:
+            real_times_days = time_steps * delta_t_days
+        else:
+            real_times_days = np.asarray(times_days, dtype=float)
+        max_days = real_times_days[-1] if len(real_times_days) else 0
+        days_per_unit, time_unit = self._time_scale(max_days)
+        real_times = real_times_days / days_per_unit
+
+        artists = self._ensure_plot_artists()
+        ax1, ax2 = artists['ax1'], artists['ax2']
+
+        # FIX: Corrected decay_per_step calculation
+        decay_per_step = np.diff(decayed, prepend=0)
+
+        # Optimization: one Rectangle per step stops scaling long before the
+        # lines do, so long runs show the decay rate as a step line instead
+        as_line = len(real_times) > self.MAX_BARS
+        self.plot_data = {'x': real_times, 'remaining': remaining,
+                          'decayed': decayed, 'rate': decay_per_step,
+                          'as_line': as_line, 'days_per_unit': days_per_unit}
+
+        for key in ('remaining', 'decayed'):
+            artists[key + '_line'].set_animated(False)
+            artists[key + '_fill'].set_visible(True)
+        self._decimate_axis(ax1)
+
+        rate_line = artists['rate_line']
+        rate_line.set_animated(False)
+        rate_line.set_visible(as_line)
+        if as_line:
+            if artists['bars'] is not None:
+                artists['bars'].remove()
+                artists['bars'] = None
+            self._decimate_axis(ax2)
+        else:
+            self._update_bars(real_times, decay_per_step)
+
+        ax1.set_xlabel(f'Time ({time_unit})', fontsize=10, weight='bold')
+        ax2.set_xlabel(f'Time ({time_unit})', fontsize=10, weight='bold')
+        for ax in (ax1, ax2):
+            # Live streaming pins the limits; hand them back to autoscaling
+            ax.set_autoscale_on(True)
+            ax.relim(visible_only=True)
+            ax.autoscale_view()
+
+        self.canvas.draw_idle()
+
+    def begin_live_plot(self, num_atoms, num_steps, delta_t_days, decay_prob):
+        """Prepare the persistent artists for blitted updates during a run."""
+        artists = self._ensure_plot_artists()
+        ax1, ax2 = artists['ax1'], artists['ax2']
+        days_per_unit, time_unit = self._time_scale(num_steps * delta_t_days)
+        scale = delta_t_days / days_per_unit
+
+        for key in ('remaining', 'decayed'):
+            artists[key + '_line'].set_data([], [])
+            artists[key + '_line'].set_markevery(max(1, num_steps // 20))
+            artists[key + '_fill'].set_visible(False)
+        for rect in artists['bars'] or ():
+            rect.set_visible(False)
+        artists['rate_line'].set_data([], [])
+        artists['rate_line'].set_visible(True)
+        self._draw_expected(days_per_unit)
+
+        # Fixed limits so the static background stays valid while streaming;
+        # the first step has the most expected decays
+        ax1.set_xlim(0, max(num_steps * scale, scale))
+        ax1.set_ylim(0, num_atoms * 1.05)
+        ax2.set_xlim(0, max(num_steps * scale, scale))
+        expected_peak = num_atoms * decay_prob
+        ax2.set_ylim(0, expected_peak + 4 * math.sqrt(expected_peak) + 1)
+        ax1.set_xlabel(f'Time ({time_unit})', fontsize=10, weight='bold')
+        ax2.set_xlabel(f'Time ({time_unit})', fontsize=10, weight='bold')
+
+        self.live_plot = {
+            'scale': scale,
+            'artists': [artists['remaining_line'], artists['decayed_line'], artists['rate_line']],
+            'background': None,
+        }
+        for artist in self.live_plot['artists']:
+            artist.set_animated(True)
+        # draw_event handler captures the background without animated artists
+        self.canvas.draw()
+
+    def stream_decay(self, time_steps, remaining, decayed, newly_decayed, first_new=0,
+                     step_units=1.0):
+        """Redraw the live artists from the whole series so far and blit them.
+
+        The series are the run's arrays up to the newest step (views of the
+        shared buffers, not copies); rows from ``first_new`` on are the ones
+        added since the last call. ``time_steps`` counts in units of
+        ``step_units`` balanced steps. Only the decimated points are scaled
+        to the axis units, so a frame allocates O(pixels) beyond the
+        decimation pass itself.
+        """
+        live = self.live_plot
+        if live is None:
+            return
+        x_scale = live['scale'] / step_units
+        num_buckets = self.plot_artists['ax1'].bbox.width or self.DEFAULT_BUCKETS
+        for artist, values in zip(live['artists'], (remaining, decayed, newly_decayed)):
+            x, y = minmax_decimate(time_steps, values, num_buckets)
+            # A short series comes back undecimated; copy it (O(pixels)) so
+            # the artists never hold views of the run's shared buffers
+            artist.set_data(x * x_scale, np.array(y))
+
+        ax2 = self.plot_artists['ax2']
+        fresh = newly_decayed[first_new:]
+        peak = fresh.max() if len(fresh) else 0
+        if peak > ax2.get_ylim()[1]:
+            # Limits changed, so the cached background is stale
+            ax2.set_ylim(0, peak * 1.25)
+            self.canvas.draw()
+            return
+        if live['background'] is None:
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(live['background'])
+        self._draw_live_artists()
+        self.canvas.blit(self.figure.bbox)
+
+    def end_live_plot(self):
+        if self.live_plot is None:
+            return
+        for artist in self.live_plot['artists']:
+            artist.set_animated(False)
+        self.live_plot = None
+
+    def _draw_live_artists(self):
+        for artist in self.live_plot['artists']:
+            artist.axes.draw_artist(artist)
+
+    def _on_canvas_draw(self, event):
+        # A full draw (first frame, resize, limit change) refreshes the cached
+        # background; animated artists are then painted on top of it
+        if self.live_plot is None:
+            return
+        self.live_plot['background'] = self.canvas.copy_from_bbox(
+            self.figure.bbox)
+        self._draw_live_artists()
+
+
+def main():
+    root = tk.Tk()
+    app = DecayVisualizerApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,78 +1,375 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import random
-import math
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-
-# Set global plot styles for the dark theme
-plt.rcParams['figure.facecolor'] = '#0A0E27'
-plt.rcParams['axes.facecolor'] = '#0D1B2A'
-plt.rcParams['text.color'] = '#FFFFFF'
-plt.rcParams['axes.labelcolor'] = '#FFFFFF'
-plt.rcParams['xtick.color'] = '#FFFFFF'
-plt.rcParams['ytick.color'] = '#FFFFFF'
-
+import time
 
-class Node:
-    def __init__(self, atom_id, decay_step):
-        self.atom_id = atom_id
-        self.decay_step = decay_step
-        self.next = None
+# Cold-start reference for the CLI's timing report, taken before the
+# heavier imports below
+_MODULE_START = time.perf_counter()
 
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+import hashlib
+import random
+import math
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import numpy as np
+
+# One decay record: 4-byte atom id + 4-byte step = 8 bytes per decay
+DECAY_RECORD = np.dtype([('atom_id', np.uint32), ('decay_step', np.uint32)])
+MAX_LOGGED_ATOMS = np.iinfo(np.uint32).max + 1
+
+# Bitset lookup tables: set bits per byte, and the position (MSB first, as
+# np.packbits stores them) of the k-th set bit of each byte
+_BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+_POPCOUNT = _BYTE_BITS.sum(axis=1).astype(np.int64)
+_SELECT_BIT = np.argsort(1 - _BYTE_BITS, axis=1, kind='stable').astype(np.uint8)
+
+
+class DecayLog:
+    """Columnar (atom_id, decay_step) log backed by packed typed arrays.
+
+    Replaces the old Node-per-decay linked list: records live in packed
+    structured arrays of CHUNK_SIZE records each, so a decay costs 8 bytes
+    plus at most one partly filled chunk. Decays arrive in nondecreasing
+    step order, so the log also keeps a CSR-style index of where each step
+    starts for O(1) per-step queries.
+    """
+    CHUNK_SIZE = 1 << 16
 
-class DecayLinkedList:
     def __init__(self):
-        self.head = None
-        self.tail = None  # Optimization: Keep track of tail for O(1) append
+        # Records in order; every chunk before the one holding position
+        # ``size`` is full
+        self._chunks = []
+        self._chunk_starts = []  # Position of each chunk's first record
+        self._capacity = 0
         self.size = 0
+        # _step_starts[s] = index of the first record with decay_step >= s
+        self._step_starts = np.zeros(0, dtype=np.int64)
+        self.last_step = -1
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed > self._capacity:
+            self._grow_records(needed)
+
+    def _grow_records(self, needed):
+        # Optimization: add a chunk instead of doubling and copying, so
+        # records are never moved and the slack stays under one chunk
+        extra = -(-(needed - self._capacity) // self.CHUNK_SIZE) * self.CHUNK_SIZE
+        self._chunks.append(np.empty(extra, dtype=DECAY_RECORD))
+        self._chunk_starts.append(self._capacity)
+        self._capacity += extra
+
+    def _locate(self, position):
+        """The chunk holding record ``position`` and the position's offset in it."""
+        starts = self._chunk_starts
+        index = len(starts) - 1
+        if position < starts[index]:
+            index = bisect_right(starts, position) - 1
+        return self._chunks[index], position - starts[index]
+
+    def _grow_step_index(self, length):
+        grown = np.empty(length, dtype=np.int64)
+        grown[:self.last_step + 1] = self._step_starts[:self.last_step + 1]
+        self._step_starts = grown
+
+    def _open_step(self, decay_step):
+        if decay_step == self.last_step:
+            return
+        if decay_step < self.last_step:
+            raise ValueError(
+                "Decays must be appended in nondecreasing step order.")
+        if decay_step >= len(self._step_starts):
+            self._grow_step_index(max(decay_step + 1, 2 * len(self._step_starts)))
+        # Steps skipped without decays start (and end) at the current size
+        self._step_starts[self.last_step + 1:decay_step + 1] = self.size
+        self.last_step = decay_step
 
     def append(self, atom_id, decay_step):
-        new_node = Node(atom_id, decay_step)
-        if not self.head:
-            self.head = new_node
-            self.tail = new_node
-        else:
-            # Optimization: Append to tail instead of traversing the whole list
-            self.tail.next = new_node
-            self.tail = new_node
+        self._open_step(decay_step)
+        self._reserve(1)
+        chunk, offset = self._locate(self.size)
+        chunk[offset] = (atom_id, decay_step)
         self.size += 1
 
+    def extend(self, atom_ids, decay_step):
+        """Append a batch of atoms that all decayed at the same step."""
+        self._open_step(decay_step)
+        count = len(atom_ids)
+        self._reserve(count)
+        written = 0
+        while written < count:
+            chunk, offset = self._locate(self.size)
+            n = min(len(chunk) - offset, count - written)
+            chunk['atom_id'][offset:offset + n] = atom_ids[written:written + n]
+            chunk['decay_step'][offset:offset + n] = decay_step
+            written += n
+            self.size += n
+
+    def rewind(self, size, last_step):
+        """Drop the records past a saved (size, last_step) position."""
+        if not (0 <= size <= self.size and -1 <= last_step <= self.last_step):
+            raise ValueError(
+                f"Cannot rewind a log of {self.size} records to {size}.")
+        self.size = size
+        self.last_step = last_step
+
+    def _step_start(self, step):
+        if step <= 0:
+            return 0
+        if step > self.last_step:
+            return self.size
+        return int(self._step_starts[step])
+
+    def _view(self, start, stop):
+        pieces = self._pieces(start, stop)
+        if len(pieces) == 1:
+            view = pieces[0]
+        else:
+            # Only a range that crosses chunks is copied, and only that range
+            view = np.concatenate(pieces) if pieces else np.empty(0, dtype=DECAY_RECORD)
+        view.flags.writeable = False
+        return view
+
+    def _pieces(self, start, stop):
+        pieces = []
+        while start < stop:
+            chunk, offset = self._locate(start)
+            piece = chunk[offset:offset + stop - start]
+            pieces.append(piece)
+            start += len(piece)
+        return pieces
+
     def get_decay_count_at_step(self, step):
-        count = 0
-        current = self.head
-        while current:
-            if current.decay_step == step:
-                count += 1
-            current = current.next
-        return count
+        return self._step_start(step + 1) - self._step_start(step)
+
+    def get_decays_at_step(self, step):
+        """Records of the atoms that decayed at ``step``."""
+        return self._view(self._step_start(step), self._step_start(step + 1))
+
+    def get_decays_in_step_range(self, first_step, last_step):
+        """Records with first_step <= decay_step <= last_step, in order."""
+        if last_step < first_step:
+            return self._view(0, 0)
+        return self._view(self._step_start(first_step),
+                          self._step_start(last_step + 1))
+
+    def get_decay_counts_per_step(self):
+        """Array whose entry k is the number of decays at step k."""
+        bounds = np.append(self._step_starts[:self.last_step + 1], self.size)
+        return np.diff(bounds)
+
+    def get_step_starts(self):
+        """Read-only step index: entry s is the position of the first record of step s."""
+        view = self._step_starts[:self.last_step + 1]
+        view.flags.writeable = False
+        return view
 
     def get_all_decays(self):
-        decays = []
-        current = self.head
-        while current:
-            decays.append((current.atom_id, current.decay_step))
-            current = current.next
-        return decays
-
+        """Read-only records; rows unpack as (atom_id, decay_step).
+
+        A view when the log fits in one chunk, otherwise a copy joining the
+        chunks. Either way it does not see records appended after it.
+        """
+        return self._view(0, self.size)
+
+    def get_decays_since(self, position):
+        """Read-only records from ``position`` on, e.g. a previous ``size``."""
+        return self._view(position, self.size)
+
+    @property
+    def nbytes(self):
+        """Bytes allocated for records, including the unused part of the last chunk."""
+        return self._capacity * DECAY_RECORD.itemsize
+
+    @classmethod
+    def from_records(cls, records, step_starts=None):
+        """Build a log from DECAY_RECORD rows already in step order.
+
+        Records that already have the DECAY_RECORD dtype (e.g. a memory-mapped
+        file) are used without copying, and appends go to new chunks after
+        them. ``step_starts`` is the saved step index, rebuilt when not given.
+        """
+        log = cls()
+        records = np.asarray(records, dtype=DECAY_RECORD)
+        log.size = log._capacity = len(records)
+        if log.size:
+            log._chunks = [records]
+            log._chunk_starts = [0]
+        steps = records['decay_step']
+        log.last_step = int(steps[-1]) if log.size else -1
+        if step_starts is None:
+            step_starts = np.searchsorted(steps, np.arange(log.last_step + 1))
+        log._step_starts = np.asarray(step_starts, dtype=np.int64)
+        return log
+
+
+# Kept for code written against the original linked-list log
+DecayLinkedList = DecayLog
+
+# Fixed 64-byte header of a MappedDecayLog data file
+MAPPED_LOG_MAGIC = b"DECAYLOG"
+MAPPED_LOG_VERSION = 1
+MAPPED_LOG_HEADER = np.dtype([
+    ('magic', 'S8'), ('version', '<u4'), ('record_size', '<u4'),
+    ('size', '<i8'), ('last_step', '<i8'), ('reserved', 'V32')])
+
+
+class MappedDecayLog(DecayLog):
+    """DecayLog whose records and step index live in memory-mapped files.
+
+    ``path`` holds a 64-byte header (magic, version, record size, record
+    count, last step) followed by the packed DECAY_RECORD rows; ``path +
+    ".idx"`` holds the int64 step-start index. Both files grow in whole
+    chunks and are only paged in as they are touched, so a log far larger
+    than RAM can be appended to and queried. The header count is updated
+    after every append, so a log reopened after a crash holds every record
+    written before it. ``mode`` is "w+" (create or truncate), "r+" (append
+    to an existing log) or "r" (read-only; opening maps the files without
+    reading them).
+    """
+    CHUNK_SIZE = 1 << 20  # Records (8 MB) added to the file at a time
+
+    def __init__(self, path, mode="r"):
+        if mode not in ("r", "r+", "w+"):
+            raise ValueError(f"Unknown mode '{mode}'. Choose from: r, r+, w+.")
+        self.path = path
+        self.index_path = path + ".idx"
+        self.mode = mode
+        if mode == "w+":
+            header = np.zeros(1, dtype=MAPPED_LOG_HEADER)
+            header['magic'] = MAPPED_LOG_MAGIC
+            header['version'] = MAPPED_LOG_VERSION
+            header['record_size'] = DECAY_RECORD.itemsize
+            header['last_step'] = -1
+            with open(path, "wb") as f:
+                f.write(header.tobytes())
+            open(self.index_path, "wb").close()
+
+        self._header = np.memmap(path, dtype=MAPPED_LOG_HEADER,
+                                 mode="r" if mode == "r" else "r+", shape=(1,))
+        header = self._header[0]
+        if header['magic'] != MAPPED_LOG_MAGIC or header['version'] != MAPPED_LOG_VERSION:
+            raise ValueError(f"{path} is not a decay log written by this version.")
+        if header['record_size'] != DECAY_RECORD.itemsize:
+            raise ValueError(f"{path} has {header['record_size']}-byte records, "
+                             f"expected {DECAY_RECORD.itemsize}.")
+        self.size = int(header['size'])
+        self.last_step = int(header['last_step'])
+        self._set_records(self._map(path, DECAY_RECORD, MAPPED_LOG_HEADER.itemsize, self.size))
+        self._step_starts = self._map(self.index_path, np.int64, 0, self.last_step + 1)
+
+    def _map(self, path, dtype, offset, length):
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        mode = "r" if self.mode == "r" else "r+"
+        return np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=(length,))
+
+    def _grow_file(self, path, dtype, offset, length):
+        if self.mode == "r":
+            raise ValueError(f"{self.path} is open read-only.")
+        # Extending the file leaves a sparse tail; mapping it again gives a
+        # larger view while views handed out earlier stay valid
+        with open(path, "r+b") as f:
+            f.truncate(offset + length * np.dtype(dtype).itemsize)
+        return self._map(path, dtype, offset, length)
+
+    def _set_records(self, records):
+        # The file is one mapping that grows in place, so it is a single chunk
+        self._chunks = [records]
+        self._chunk_starts = [0]
+        self._capacity = len(records)
+
+    def _grow_records(self, needed):
+        capacity = -(-needed // self.CHUNK_SIZE) * self.CHUNK_SIZE
+        self._set_records(self._grow_file(
+            self.path, DECAY_RECORD, MAPPED_LOG_HEADER.itemsize, capacity))
+
+    def _grow_step_index(self, length):
+        length = -(-length // self.CHUNK_SIZE) * self.CHUNK_SIZE
+        self._step_starts = self._grow_file(self.index_path, np.int64, 0, length)
+
+    def _sync_header(self):
+        self._header['size'] = self.size
+        self._header['last_step'] = self.last_step
 
-# Half-life data
+    def append(self, atom_id, decay_step):
+        super().append(atom_id, decay_step)
+        self._sync_header()
+
+    def extend(self, atom_ids, decay_step):
+        super().extend(atom_ids, decay_step)
+        self._sync_header()
+
+    def rewind(self, size, last_step):
+        super().rewind(size, last_step)
+        self._sync_header()
+
+    def flush(self):
+        """Write mapped pages back to disk."""
+        for array in (*self._chunks, self._step_starts, self._header):
+            if isinstance(array, np.memmap) and self.mode != "r":
+                array.flush()
+
+    def close(self):
+        """Flush and trim both files to their used length."""
+        if self.mode != "r":
+            self.flush()
+            self._chunks = []
+            self._step_starts = None
+            with open(self.path, "r+b") as f:
+                f.truncate(MAPPED_LOG_HEADER.itemsize + self.size * DECAY_RECORD.itemsize)
+            with open(self.index_path, "r+b") as f:
+                f.truncate((self.last_step + 1) * np.dtype(np.int64).itemsize)
+        self._chunks = []
+        self._step_starts = None
+        self._header = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Half-life data. "daughter" names the decay product; a daughter missing from
+# this table and CHAIN_NUCLIDES is stable.
 ISOTOPES = {
-    "Carbon-14": {"half_life": 5730, "unit": "years"},
-    "Uranium-238": {"half_life": 4.468e9, "unit": "years"},
+    "Carbon-14": {"half_life": 5730, "unit": "years", "daughter": "Nitrogen-14"},
+    "Uranium-238": {"half_life": 4.468e9, "unit": "years", "daughter": "Thorium-234"},
     "Plutonium-239": {"half_life": 24110, "unit": "years"},
-    "Iodine-131": {"half_life": 8.02, "unit": "days"},
-    "Cobalt-60": {"half_life": 5.27, "unit": "years"},
-    "Radium-226": {"half_life": 1600, "unit": "years"},
-    "Radon-222": {"half_life": 3.82, "unit": "days"},
-    "Strontium-90": {"half_life": 28.8, "unit": "years"},
-    "Cesium-137": {"half_life": 30.17, "unit": "years"},
-    "Tritium (H-3)": {"half_life": 12.32, "unit": "years"},
-    "Polonium-210": {"half_life": 138, "unit": "days"},
+    "Iodine-131": {"half_life": 8.02, "unit": "days", "daughter": "Xenon-131"},
+    "Cobalt-60": {"half_life": 5.27, "unit": "years", "daughter": "Nickel-60"},
+    "Radium-226": {"half_life": 1600, "unit": "years", "daughter": "Radon-222"},
+    "Radon-222": {"half_life": 3.82, "unit": "days", "daughter": "Polonium-218"},
+    "Strontium-90": {"half_life": 28.8, "unit": "years", "daughter": "Yttrium-90"},
+    "Cesium-137": {"half_life": 30.17, "unit": "years", "daughter": "Barium-137m"},
+    "Tritium (H-3)": {"half_life": 12.32, "unit": "years", "daughter": "Helium-3"},
+    "Polonium-210": {"half_life": 138, "unit": "days", "daughter": "Lead-206"},
     "Custom": {"half_life": None, "unit": "time units"}
 }
 
+# Intermediate nuclides that only decay_chains reads, so the U-238 series and
+# the short-lived products of Sr-90/Cs-137 can be followed without adding them
+# to the isotope list of the GUI, the CLI and sweeps
+CHAIN_NUCLIDES = {
+    "Thorium-234": {"half_life": 24.10, "unit": "days", "daughter": "Protactinium-234m"},
+    "Protactinium-234m": {"half_life": 1.159, "unit": "minutes", "daughter": "Uranium-234"},
+    "Uranium-234": {"half_life": 245500, "unit": "years", "daughter": "Thorium-230"},
+    "Thorium-230": {"half_life": 75380, "unit": "years", "daughter": "Radium-226"},
+    "Polonium-218": {"half_life": 3.098, "unit": "minutes", "daughter": "Lead-214"},
+    "Lead-214": {"half_life": 26.8, "unit": "minutes", "daughter": "Bismuth-214"},
+    "Bismuth-214": {"half_life": 19.9, "unit": "minutes", "daughter": "Polonium-214"},
+    "Polonium-214": {"half_life": 164.3e-6, "unit": "seconds", "daughter": "Lead-210"},
+    "Lead-210": {"half_life": 22.2, "unit": "years", "daughter": "Bismuth-210"},
+    "Bismuth-210": {"half_life": 5.012, "unit": "days", "daughter": "Polonium-210"},
+    "Yttrium-90": {"half_life": 64.0, "unit": "hours", "daughter": "Zirconium-90"},
+    "Barium-137m": {"half_life": 2.552, "unit": "minutes", "daughter": "Barium-137"},
+}
+
 
 def to_days(value, unit):
     """Convert half-life value to days."""
@@ -83,29 +380,319 @@ def to_days(value, unit):
         return value * 365.25
     elif unit.startswith('day'):
         return value
+    elif unit.startswith('hour'):
+        return value / 24.0
+    elif unit.startswith('minute'):
+        return value / 1440.0
+    elif unit.startswith('second'):
+        return value / 86400.0
     else:
         return value
 
 
+# Simulation engines: "python" is the original per-atom loop kept as the
+# reference path, "numpy" holds atom state in an array and draws a whole
+# step's decays in one vectorized call, "binomial" only tracks counts and
+# samples each step's decays as Binomial(remaining, p) in O(1), "event"
+# draws every atom's lifetime once and bins the lifetimes into steps.
+ENGINES = ("numpy", "python", "binomial", "event")
+
+
+def _python_seed(seed):
+    """Turn a NumPy SeedSequence into an int that random.Random accepts."""
+    if isinstance(seed, np.random.SeedSequence):
+        return int.from_bytes(seed.generate_state(4).tobytes(), 'little')
+    return seed
+
+
+# Random number backends. Engines draw uniforms per (step, chunk) through
+# fill(); "stdlib", "pcg64" and "philox" are single sequential streams, so
+# how the draws are split into calls does not change them, while "counter"
+# derives an independent Philox stream from (seed, step, chunk), so any chunk
+# can be drawn on its own, in any order, with the same result.
+RNG_BACKENDS = ("stdlib", "pcg64", "philox", "counter")
+
+
+class StdlibRNG:
+    """random.Random, one double per call; uniforms only."""
+    name = "stdlib"
+
+    def __init__(self, seed=None):
+        self._random = random.Random(_python_seed(seed))
+
+    def fill(self, out, step=0, chunk=0):
+        rand = self._random.random
+        out[:] = [rand() for _ in range(len(out))]
+        return out
+
+    def generator(self, step=0):
+        raise ValueError("The stdlib RNG backend only draws uniforms; "
+                         "use a NumPy backend with this engine.")
+
+    def get_state(self):
+        """JSON-serializable position of the stream."""
+        version, internal, gauss_next = self._random.getstate()
+        return [version, list(internal), gauss_next]
+
+    def set_state(self, state):
+        version, internal, gauss_next = state
+        self._random.setstate((version, tuple(internal), gauss_next))
+
+
+class NumpyRNG:
+    """One sequential NumPy Generator (PCG64 or Philox) filling buffers in bulk."""
+
+    def __init__(self, seed=None, bit_generator="pcg64"):
+        seed_seq = (seed if isinstance(seed, np.random.SeedSequence)
+                    else np.random.SeedSequence(seed))
+        self.name = bit_generator
+        bit_generators = {"pcg64": np.random.PCG64, "philox": np.random.Philox}
+        self._generator = np.random.Generator(bit_generators[bit_generator](seed_seq))
+
+    def fill(self, out, step=0, chunk=0):
+        return self._generator.random(out=out)
+
+    def generator(self, step=0):
+        return self._generator
+
+    def get_state(self):
+        """JSON-serializable position of the stream."""
+        def plain(value):
+            if isinstance(value, dict):
+                return {key: plain(item) for key, item in value.items()}
+            return value.tolist() if isinstance(value, np.ndarray) else value
+        return plain(self._generator.bit_generator.state)
+
+    def set_state(self, state):
+        self._generator.bit_generator.state = state
+
+
+class CounterRNG:
+    """Counter-based Philox: the stream of (step, chunk) depends on nothing else."""
+    name = "counter"
+
+    def __init__(self, seed=None):
+        seed_seq = (seed if isinstance(seed, np.random.SeedSequence)
+                    else np.random.SeedSequence(seed))
+        self._key = seed_seq.generate_state(2, np.uint64)
+
+    def generator(self, step=0, chunk=0):
+        # The low counter words advance as numbers are drawn; the high words
+        # pin the substream, leaving 2^128 blocks to each (step, chunk)
+        return np.random.Generator(np.random.Philox(
+            key=self._key, counter=[0, 0, chunk, step]))
+
+    def fill(self, out, step=0, chunk=0):
+        return self.generator(step, chunk).random(out=out)
+
+    def get_state(self):
+        # Every draw is derived from (seed, step, chunk), so there is no
+        # position to save
+        return None
+
+    def set_state(self, state):
+        pass
+
+
+def make_rng(backend, seed=None):
+    if backend == "stdlib":
+        return StdlibRNG(seed)
+    if backend in ("pcg64", "philox"):
+        return NumpyRNG(seed, backend)
+    if backend == "counter":
+        return CounterRNG(seed)
+    raise ValueError(
+        f"Unknown RNG backend '{backend}'. Choose from: {', '.join(RNG_BACKENDS)}.")
+
+
+def seed_to_json(seed):
+    """JSON form of a seed, as stored by exports, checkpoints and sweeps.
+
+    SeedSequence entropy is written as a string, since 128-bit integers do
+    not survive every JSON reader.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        entropy = seed.entropy
+        if isinstance(entropy, (list, tuple, np.ndarray)):
+            entropy = [str(int(value)) for value in entropy]
+        else:
+            entropy = str(entropy)
+        return {"entropy": entropy, "spawn_key": list(seed.spawn_key)}
+    return seed
+
+
+def seed_from_json(seed):
+    """Inverse of seed_to_json; also reads entropy stored as a plain integer."""
+    if isinstance(seed, dict):
+        entropy = seed["entropy"]
+        if isinstance(entropy, list):
+            entropy = [int(value) for value in entropy]
+        else:
+            entropy = int(entropy)
+        return np.random.SeedSequence(entropy, spawn_key=tuple(seed["spawn_key"]))
+    return seed
+
+
+def write_atomically(path, write, mode="w", fsync=False):
+    """Call write(file) on a temporary file, then rename it over ``path``.
+
+    Readers see the old file or the whole new one, never half of one; with
+    ``fsync`` the data is on disk before the rename.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, mode) as f:
+        write(f)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
 class RadioactiveDecaySimulator:
-    def __init__(self):
+    # Atoms per chunk of the numpy engine's bitset (a multiple of 8); bounds
+    # the temporary arrays of a step to a few MB however many atoms there are
+    BITSET_CHUNK = 1 << 20
+    # The numpy engine switches from the bitset to a uint32 array of survivor
+    # ids once fewer than 1 / COMPACT_RATIO of the atoms remain; at 32 the ids
+    # never take more memory than the bitset did (0 disables the switch)
+    COMPACT_RATIO = 32
+
+    def __init__(self, engine="numpy", seed=None, cache=None, rng_backend=None,
+                 decay_log_path=None, threads=1, keep_decay_log=True):
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine '{engine}'. Choose from: {', '.join(ENGINES)}.")
+        if threads < 1:
+            raise ValueError("Threads must be at least 1.")
+        if threads > 1 and engine != "numpy":
+            raise ValueError("Only the numpy engine steps in parallel threads.")
+        if rng_backend is None:
+            if threads > 1:
+                rng_backend = "counter"
+            else:
+                rng_backend = "stdlib" if engine == "python" else "pcg64"
+        if rng_backend not in RNG_BACKENDS:
+            raise ValueError(
+                f"Unknown RNG backend '{rng_backend}'. Choose from: {', '.join(RNG_BACKENDS)}.")
+        if rng_backend == "stdlib" and engine in ("binomial", "event"):
+            raise ValueError(
+                f"The {engine} engine needs a NumPy RNG backend, not stdlib.")
+        if threads > 1 and rng_backend != "counter":
+            # Sequential streams hand out draws in chunk order, so chunks
+            # drawn concurrently would get a different run each time
+            raise ValueError("Parallel threads need the counter RNG backend.")
+        self.engine = engine
+        self.rng_backend = rng_backend
+        self.seed = seed
+        self.cache = cache  # Optional SimulationCache for run_simulation
+        # With a path the decay log is a MappedDecayLog file instead of RAM
+        self.decay_log_path = decay_log_path
+        # Callers that only read the series (sweeps, ensembles) skip the log
+        self.keep_decay_log = keep_decay_log
         self.atoms = []
-        self.decay_list = DecayLinkedList()
+        self.decay_list = DecayLog()
         self.remaining_atoms = []
         self.decayed_atoms = []
         self.time_steps = []
         self.current_isotope = None
         self.delta_t_days = None
+        self.times_days = None  # Per-step times of an adaptive run
+        self.num_atoms = 0
         self.current_remaining = 0  # Optimization counter
+        self.rng = None
+        self.threads = threads
+        self._executor = None  # Created by the first parallel step
+        self._buffers = threading.local()  # Per-thread uniform buffer, reused by every chunk
 
     def initialize(self, num_atoms):
-        self.atoms = [{'id': i, 'decayed': False} for i in range(num_atoms)]
-        self.decay_list = DecayLinkedList()
+        if self.engine != "binomial" and num_atoms > MAX_LOGGED_ATOMS:
+            raise ValueError(
+                "Too many atoms for the decay log; use the binomial engine.")
+        self._init_atoms(num_atoms)
+        self.rng = make_rng(self.rng_backend, self.seed)
+        if self.engine == "binomial" or not self.keep_decay_log:
+            self.decay_list = None
+        elif self.decay_log_path is not None:
+            self.decay_list = MappedDecayLog(self.decay_log_path, "w+")
+        else:
+            self.decay_list = DecayLog()
+        self.num_atoms = num_atoms
         self.current_remaining = num_atoms
+        self.times_days = None
         self.remaining_atoms = [num_atoms]
         self.decayed_atoms = [0]
         self.time_steps = [0]
 
+    def _init_atoms(self, num_atoms):
+        """Per-atom state with every atom undecayed."""
+        if self.engine == "numpy":
+            # Packed bitset, 1 bit per atom (set = still undecayed); atom id
+            # is the bit index, so 100M atoms take 12.5 MB
+            self.atoms = np.full(-(-num_atoms // 8), 0xFF, dtype=np.uint8)
+            if num_atoms % 8:
+                self.atoms[-1] = (0xFF << (8 - num_atoms % 8)) & 0xFF
+            # Survivors per chunk, so fully decayed chunks are skipped
+            num_chunks = -(-num_atoms // self.BITSET_CHUNK)
+            self._chunk_alive = np.full(num_chunks, self.BITSET_CHUNK, dtype=np.int64)
+            if num_chunks:
+                self._chunk_alive[-1] = num_atoms - (num_chunks - 1) * self.BITSET_CHUNK
+            self._compacted = False
+        elif self.engine == "binomial":
+            # Counts only: no per-atom state and no decay log
+            self.atoms = None
+        elif self.engine == "event":
+            # Lifetimes need decay_prob, so they are drawn on the first step
+            self.atoms = None
+        else:
+            # Ids of the undecayed atoms only, 4 bytes each, in id order;
+            # each step keeps the survivors, so the array shrinks as atoms decay
+            self.atoms = array('I')
+            for start in range(0, num_atoms, self.BITSET_CHUNK):
+                stop = min(start + self.BITSET_CHUNK, num_atoms)
+                self.atoms.frombytes(np.arange(start, stop, dtype=np.uint32).tobytes())
+
+    def restore(self, num_atoms, remaining, decay_log, rng_state):
+        """Put the simulator back in the state of a saved run.
+
+        Survivors are not saved: every atom missing from ``decay_log`` is
+        still undecayed, so the per-atom state is rebuilt from the log.
+        The event engine redraws its lifetimes from the seed on the next
+        step, so its ``rng_state`` is not used. The series lists are left
+        for the caller.
+        """
+        # The python engine's survivor array is filled from the log below
+        self._init_atoms(0 if self.engine == "python" else num_atoms)
+        self.rng = make_rng(self.rng_backend, self.seed)
+        if self.engine != "event":
+            self.rng.set_state(rng_state)
+        self.decay_list = decay_log
+        self.num_atoms = num_atoms
+        self.current_remaining = remaining
+        self.times_days = None
+        if self.engine not in ("numpy", "python"):
+            return
+
+        num_chunks = -(-num_atoms // self.BITSET_CHUNK)
+        if self.engine == "numpy":
+            bitset = self.atoms
+        else:
+            bitset = np.full(-(-num_atoms // 8), 0xFF, dtype=np.uint8)
+        # Each decayed atom clears its own bit exactly once
+        records = decay_log.get_all_decays()
+        for start in range(0, len(records), self.BITSET_CHUNK):
+            ids = records['atom_id'][start:start + self.BITSET_CHUNK]
+            masks = np.right_shift(np.uint8(0x80), (ids & 7).astype(np.uint8))
+            np.bitwise_and.at(bitset, ids >> 3, ~masks)
+            if self.engine == "numpy":
+                self._chunk_alive -= np.bincount(ids // self.BITSET_CHUNK, minlength=num_chunks)
+        if self.engine == "python":
+            chunk_bytes = self.BITSET_CHUNK // 8
+            for chunk in range(num_chunks):
+                bits = np.unpackbits(bitset[chunk * chunk_bytes:(chunk + 1) * chunk_bytes])
+                ids = np.flatnonzero(bits[:num_atoms - chunk * self.BITSET_CHUNK])
+                self.atoms.frombytes(
+                    (ids + chunk * self.BITSET_CHUNK).astype(np.uint32).tobytes())
+
     def calculate_decay_probability(self, half_life_days, delta_t_days):
         if half_life_days is None or half_life_days <= 0:
             raise ValueError("Half-life must be positive.")
@@ -115,21 +702,200 @@ class RadioactiveDecaySimulator:
         decay_constant = math.log(2) / half_life_days
         return 1 - math.exp(-decay_constant * delta_t_days)
 
-    def simulate_step(self, step_index, decay_prob):
-        newly_decayed = 0
+    def calculate_step_size(self, half_life_value, half_life_unit, balanced_fraction=50):
+        """Return (delta_t_days, decay_prob) for Δt = T½ / balanced_fraction."""
+        half_life_days = to_days(half_life_value, half_life_unit)
+        if half_life_days is None:
+            raise ValueError("Half-life value required.")
+
+        delta_t_days = half_life_days / float(balanced_fraction)
+        return delta_t_days, self.calculate_decay_probability(half_life_days, delta_t_days)
+
+    def calculate_expected_decay(self, num_atoms, decay_prob, num_steps):
+        """Closed-form mean and standard deviation of the remaining count.
+
+        An atom survives k steps with probability (1 - p)^k, so the remaining
+        count after k steps is Binomial(N, (1 - p)^k) and needs no random
+        draws. Returns (expected_remaining, expected_decayed, std) arrays
+        indexed by step 0..num_steps.
+        """
+        survival = np.power(1.0 - decay_prob, np.arange(num_steps + 1))
+        expected_remaining = num_atoms * survival
+        std = np.sqrt(num_atoms * survival * (1.0 - survival))
+        return expected_remaining, num_atoms - expected_remaining, std
+
+    def run_analytic(self, num_atoms, half_life_value, half_life_unit, num_steps,
+                     balanced_fraction=50, k_sigma=3):
+        """Expected decay curves with ±k_sigma bands, computed without sampling."""
+        delta_t_days, decay_prob = self.calculate_step_size(
+            half_life_value, half_life_unit, balanced_fraction)
+        remaining, decayed, std = self.calculate_expected_decay(
+            num_atoms, decay_prob, num_steps)
+        band = k_sigma * std
+        return {
+            'time_steps': np.arange(num_steps + 1),
+            'delta_t_days': delta_t_days,
+            'remaining': remaining,
+            'decayed': decayed,
+            'std': std,
+            'remaining_band': (np.maximum(remaining - band, 0), np.minimum(remaining + band, num_atoms)),
+            'decayed_band': (np.maximum(decayed - band, 0), np.minimum(decayed + band, num_atoms)),
+        }
 
-        # Only iterate through atoms that haven't decayed yet is slightly harder
-        # with a simple list, but iterating all is okay if O(1) operations inside.
-        for atom in self.atoms:
-            if not atom['decayed']:
-                if random.random() < decay_prob:
-                    atom['decayed'] = True
-                    self.decay_list.append(atom['id'], step_index)
-                    newly_decayed += 1
+    def _uniforms(self, count, step_index, chunk):
+        """Return ``count`` uniforms of (step, chunk), drawn into a reused buffer."""
+        buffer = getattr(self._buffers, "draws", None)
+        if buffer is None or len(buffer) < count:
+            buffer = self._buffers.draws = np.empty(max(count, self.BITSET_CHUNK))
+        return self.rng.fill(buffer[:count], step_index, chunk)
+
+    def _step_python(self, step_index, decay_prob):
+        atoms = self.atoms
+        survivors = array('I')
+        keep = survivors.append
+        decayed_ids = array('I')
+        log = decayed_ids.append
+
+        # Optimization: only survivors are stored, so the loop never visits
+        # an atom that has already decayed. Draws come per BITSET_CHUNK id
+        # range in id order, exactly as the numpy engine takes them, so both
+        # engines give the same run for the same seed and backend.
+        start = 0
+        while start < len(atoms):
+            chunk = atoms[start] // self.BITSET_CHUNK
+            end = bisect_left(atoms, (chunk + 1) * self.BITSET_CHUNK, start)
+            draws = self._uniforms(end - start, step_index, chunk).tolist()
+            for atom_id, draw in zip(atoms[start:end], draws):
+                if draw < decay_prob:
+                    log(atom_id)
+                else:
+                    keep(atom_id)
+            start = end
+        self.atoms = survivors
+        if self.decay_list is not None:
+            self.decay_list.extend(np.frombuffer(decayed_ids, dtype=np.uint32), step_index)
+        return len(decayed_ids)
+
+    def _compact_survivors(self):
+        """Replace the bitset with the sorted ids of the undecayed atoms."""
+        chunk_bytes = self.BITSET_CHUNK // 8
+        parts = [np.empty(0, dtype=np.uint32)]
+        for chunk in np.flatnonzero(self._chunk_alive):
+            bits = np.unpackbits(self.atoms[chunk * chunk_bytes:(chunk + 1) * chunk_bytes])
+            parts.append((np.flatnonzero(bits) + chunk * self.BITSET_CHUNK).astype(np.uint32))
+        self.atoms = np.concatenate(parts)
+        self._chunk_alive = None
+        self._compacted = True
+
+    def _map_chunks(self, func, chunks):
+        """Results of func over chunks, in chunk order, on the thread pool if there is one.
+
+        Chunks cover disjoint atoms and, with the counter backend, disjoint
+        RNG substreams, so running them concurrently does not change them;
+        merging in chunk order keeps the decay log identical too.
+        """
+        if self.threads == 1:
+            return map(func, chunks)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.threads)
+        return self._executor.map(func, chunks)
+
+    def _step_numpy(self, step_index, decay_prob):
+        if (not self._compacted and self.COMPACT_RATIO and
+                self.current_remaining * self.COMPACT_RATIO < self.num_atoms):
+            self._compact_survivors()
+        if self._compacted:
+            # Optimization: mask-compact the survivor ids every step, so the
+            # step costs O(current_remaining) instead of O(num_atoms). Ids stay
+            # in order, so the draws match the bitset path exactly.
+            decays = np.empty(self.atoms.size, dtype=bool)
+            chunks, starts = np.unique(self.atoms // self.BITSET_CHUNK, return_index=True)
+            ends = np.append(starts[1:], self.atoms.size)
+
+            def draw(span):
+                chunk, start, end = span
+                decays[start:end] = self._uniforms(end - start, step_index, chunk) < decay_prob
+
+            for _ in self._map_chunks(draw, zip(chunks.tolist(), starts.tolist(), ends.tolist())):
+                pass
+            decayed_ids = self.atoms[decays]
+            self.atoms = self.atoms[~decays]
+            if self.decay_list is not None:
+                self.decay_list.extend(decayed_ids, step_index)
+            return int(decayed_ids.size)
+
+        chunk_bytes = self.BITSET_CHUNK // 8
+
+        def decay_chunk(chunk):
+            # One draw per survivor in id order; only the ranks of the
+            # decaying survivors are turned back into atom ids
+            ranks = np.flatnonzero(self._uniforms(
+                self._chunk_alive[chunk], step_index, chunk) < decay_prob)
+            if ranks.size == 0:
+                return ranks
+            packed = self.atoms[chunk * chunk_bytes:(chunk + 1) * chunk_bytes]
+            counts = _POPCOUNT[packed]
+            ends = np.cumsum(counts)
+            byte_index = np.searchsorted(ends, ranks, side='right')
+            bytes_hit = packed[byte_index]
+            bit = _SELECT_BIT[bytes_hit, ranks - (ends[byte_index] - counts[byte_index])]
+            decayed = byte_index * 8 + bit
+
+            # Clear the decayed bits; several may share a byte
+            first, starts = np.unique(byte_index, return_index=True)
+            masks = np.right_shift(np.uint8(0x80), bit)
+            packed[first] &= ~np.bitwise_or.reduceat(masks, starts)
+            self._chunk_alive[chunk] -= decayed.size
+            return decayed + chunk * self.BITSET_CHUNK
+
+        newly_decayed = 0
+        for decayed in self._map_chunks(decay_chunk, np.flatnonzero(self._chunk_alive).tolist()):
+            if decayed.size:
+                if self.decay_list is not None:
+                    self.decay_list.extend(decayed, step_index)
+                newly_decayed += int(decayed.size)
+        return newly_decayed
+
+    def _step_binomial(self, step_index, decay_prob):
+        return int(self.rng.generator(step_index).binomial(self.current_remaining, decay_prob))
+
+    def _draw_lifetimes(self, decay_prob):
+        """Draw every atom's decay step once and sort atoms by it."""
+        # Lifetime measured in steps is exponential with rate -ln(1 - p), so
+        # an atom decays during step floor(t) + 1 with exactly the per-step
+        # probability p of the stepwise model.
+        with np.errstate(divide='ignore'):
+            rate = -np.log1p(-decay_prob)
+        lifetimes = self.rng.generator(0).exponential(1.0 / rate, self.num_atoms)
+        self.atoms = np.floor(lifetimes).astype(np.int64) + 1
+        self._decay_order = np.argsort(self.atoms, kind='stable')
+        self._sorted_steps = self.atoms[self._decay_order]
+        self._event_prob = decay_prob
+
+    def _step_event(self, step_index, decay_prob):
+        if self.atoms is None:
+            self._draw_lifetimes(decay_prob)
+        elif decay_prob != self._event_prob:
+            raise ValueError(
+                "The event engine needs a constant decay probability.")
+        lo = np.searchsorted(self._sorted_steps, step_index, side='left')
+        hi = np.searchsorted(self._sorted_steps, step_index, side='right')
+        if self.decay_list is not None:
+            self.decay_list.extend(self._decay_order[lo:hi], step_index)
+        return int(hi - lo)
+
+    def advance(self, step_index, decay_prob):
+        """Decay one step without recording it; returns the newly decayed count."""
+        newly_decayed = getattr(self, "_step_" + self.engine)(
+            step_index, decay_prob)
 
         # Optimization: Update counts mathematically instead of recounting list
         self.current_remaining -= newly_decayed
-        total_decayed = len(self.atoms) - self.current_remaining
+        return newly_decayed
+
+    def simulate_step(self, step_index, decay_prob):
+        self.advance(step_index, decay_prob)
+        total_decayed = self.num_atoms - self.current_remaining
 
         self.remaining_atoms.append(self.current_remaining)
         self.decayed_atoms.append(total_decayed)
@@ -137,452 +903,721 @@ class RadioactiveDecaySimulator:
 
         return self.current_remaining, total_decayed
 
-    def run_simulation(self, num_atoms, half_life_value, half_life_unit, num_steps, balanced_fraction=50):
-        self.initialize(num_atoms)
-
-        half_life_days = to_days(half_life_value, half_life_unit)
-        if half_life_days is None:
-            raise ValueError("Half-life value required.")
+    def iter_simulation(self, num_atoms, half_life_value, half_life_unit, num_steps,
+                        balanced_fraction=50, chunk_size=None):
+        """Yield (step, remaining, decayed_total, newly_decayed) as the run goes.
 
-        delta_t_days = half_life_days / float(balanced_fraction)
-        self.delta_t_days = delta_t_days
-
-        decay_prob = self.calculate_decay_probability(
-            half_life_days, delta_t_days)
+        Nothing is accumulated, so memory stays constant however many steps
+        run, and the caller may stop early by leaving the loop. With
+        ``chunk_size`` the records come as int64 arrays of shape (n, 4)
+        holding up to ``chunk_size`` steps each. Step 0 is the initial state.
+        """
+        self.initialize(num_atoms)
 
+        self.delta_t_days, decay_prob = self.calculate_step_size(
+            half_life_value, half_life_unit, balanced_fraction)
+
+        records = self._iter_steps(num_atoms, num_steps, decay_prob)
+        if chunk_size is None:
+            yield from records
+            return
+
+        chunk = np.empty((chunk_size, 4), dtype=np.int64)
+        filled = 0
+        for record in records:
+            chunk[filled] = record
+            filled += 1
+            if filled == chunk_size:
+                yield chunk.copy()
+                filled = 0
+        if filled:
+            yield chunk[:filled].copy()
+
+    def _iter_steps(self, num_atoms, num_steps, decay_prob):
+        yield 0, num_atoms, 0, 0
         for step in range(1, num_steps + 1):
-            remaining, decayed = self.simulate_step(step, decay_prob)
+            newly_decayed = self.advance(step, decay_prob)
+            remaining = self.current_remaining
+            yield step, remaining, num_atoms - remaining, newly_decayed
             if remaining == 0:
                 break
 
-        return self.time_steps, self.remaining_atoms, self.decayed_atoms, self.delta_t_days
+    def iter_adaptive(self, num_atoms, half_life_value, half_life_unit, duration_days,
+                      tolerance=0.05, balanced_fraction=50, max_decay_prob=0.5,
+                      max_growth=2.0):
+        """Yield (step, time_days, remaining, decayed_total, newly_decayed) with adaptive Δt.
+
+        Each step is sized so the expected decays are at most ``tolerance``
+        of the remaining atoms (counts below 1 / tolerance² count as that
+        floor) plus one sigma of their counting noise, the same rule as
+        DecayChainSimulator.iter_adaptive: a smaller tolerance gives finer
+        steps, which may be shorter than the balanced T½ / balanced_fraction
+        the run starts from. As the population thins the noise allowance
+        lets Δt grow, by at most ``max_growth`` per step and up to a per-step
+        decay probability of ``max_decay_prob``, so the tail of a long run
+        takes a few large steps instead of thousands of empty ones. The last
+        step lands exactly on ``duration_days``.
+        """
+        if self.engine == "event":
+            raise ValueError(
+                "The event engine needs a constant decay probability; "
+                "use fixed steps with it.")
+        if duration_days <= 0:
+            raise ValueError("Duration must be positive.")
+        if tolerance <= 0:
+            raise ValueError("Tolerance must be positive.")
+        floor = 1.0 / tolerance ** 2
 
+        half_life_days = to_days(half_life_value, half_life_unit)
+        balanced_step_days, _ = self.calculate_step_size(
+            half_life_value, half_life_unit, balanced_fraction)
+        decay_constant = math.log(2) / half_life_days
+        max_step_days = -math.log1p(-max_decay_prob) / decay_constant
 
-class ModernButton(tk.Canvas):
-    def __init__(self, parent, text, command, bg_color="#00FF41", hover_color="#00CC33", **kwargs):
-        super().__init__(parent, height=45,
-                         bg=parent['bg'], highlightthickness=0, **kwargs)
-        self.command = command
-        self.bg_color = bg_color
-        self.hover_color = hover_color
-        self.text = text
-        self.bind("<Configure>", lambda e: self.draw_button(self.bg_color))
-        self.draw_button(bg_color)
-        self.bind("<Enter>", lambda e: self.on_hover())
-        self.bind("<Leave>", lambda e: self.on_leave())
-        self.bind("<Button-1>", lambda e: self.on_click())
-
-    def draw_button(self, color):
-        self.delete("all")
-        width = self.winfo_width() or 200
-        height = 45
-        self.create_rounded_rect(
-            2, 2, width-2, height-2, radius=12, fill=color, outline="")
-        self.create_text(width//2, height//2, text=self.text,
-                         fill="#0A0E27", font=("Segoe UI", 11, "bold"))
-
-    def create_rounded_rect(self, x1, y1, x2, y2, radius=25, **kwargs):
-        points = [x1+radius, y1, x2-radius, y1, x2, y1, x2, y1+radius,
-                  x2, y2-radius, x2, y2, x2-radius, y2, x1+radius, y2,
-                  x1, y2, x1, y2-radius, x1, y1+radius, x1, y1]
-        return self.create_polygon(points, smooth=True, **kwargs)
-
-    def on_hover(self):
-        self.draw_button(self.hover_color)
-
-    def on_leave(self):
-        self.draw_button(self.bg_color)
-
-    def on_click(self):
-        if self.command:
-            self.command()
-
-
-class DecayVisualizerApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Radioactive Decay Visualizer (Physics Mode)")
-        self.root.geometry("1400x900")
-
-        self.colors = {
-            'bg': '#0A0E27',
-            'panel1': '#1A0B2E',
-            'panel2': '#16213E',
-            'panel3': '#0F3460',
-            'accent': '#00FF41',
-            'success': '#39FF14',
-            'danger': '#FF006E',
-            'warning': '#FFFF00',
-            'info': '#00D9FF',
-            'text': '#FFFFFF',
-            'text_neon': '#00FF41',
-            'border_neon': '#FF006E',
-            'glow': '#8A2BE2'
-        }
+        self.initialize(num_atoms)
+        self.delta_t_days = balanced_step_days
+        self.times_days = [0.0]
+        yield 0, 0.0, num_atoms, 0, 0
+
+        time_days = 0.0
+        step_days = balanced_step_days
+        step = 0
+        while time_days < duration_days and self.current_remaining > 0:
+            remaining = self.current_remaining
+            # Expected decays R * (1 - exp(-λΔt)) = allowed change, solved for Δt
+            allowed = tolerance * max(remaining, floor) + math.sqrt(remaining)
+            fraction = min(allowed / remaining, max_decay_prob)
+            wanted = -math.log1p(-fraction) / decay_constant
+            step_days = min(wanted, max_step_days, step_days * max_growth)
+            step_days = min(step_days, duration_days - time_days)
+
+            step += 1
+            newly_decayed = self.advance(
+                step, self.calculate_decay_probability(half_life_days, step_days))
+            time_days += step_days
+            self.times_days.append(time_days)
+            remaining = self.current_remaining
+            yield step, time_days, remaining, num_atoms - remaining, newly_decayed
+
+    def max_adaptive_steps(self, half_life_value, half_life_unit, duration_days,
+                           tolerance=0.05, balanced_fraction=50, max_decay_prob=0.5):
+        """Upper bound on the steps iter_adaptive takes after step 0.
+
+        Every step but the last is at least the shorter of the balanced Δt
+        and the step whose decay probability is min(tolerance,
+        max_decay_prob), so callers can size buffers before the run.
+        """
+        if duration_days <= 0 or tolerance <= 0:
+            raise ValueError("Duration and tolerance must be positive.")
+        decay_constant = math.log(2) / to_days(half_life_value, half_life_unit)
+        balanced_step_days, _ = self.calculate_step_size(
+            half_life_value, half_life_unit, balanced_fraction)
+        shortest = min(balanced_step_days,
+                       -math.log1p(-min(tolerance, max_decay_prob)) / decay_constant)
+        return math.ceil(duration_days / shortest) + 1
+
+    def run_adaptive(self, num_atoms, half_life_value, half_life_unit, duration_days, **kwargs):
+        """Run iter_adaptive to the end.
+
+        Returns (time_steps, remaining, decayed, times_days); times_days
+        holds the non-uniform time of every step.
+        """
+        records = self.iter_adaptive(
+            num_atoms, half_life_value, half_life_unit, duration_days, **kwargs)
+        next(records)  # Step 0 is already recorded by initialize()
+
+        for step, _, remaining, decayed, _ in records:
+            self.remaining_atoms.append(remaining)
+            self.decayed_atoms.append(decayed)
+            self.time_steps.append(step)
+        return self.time_steps, self.remaining_atoms, self.decayed_atoms, self.times_days
 
-        self.root.configure(bg=self.colors['bg'])
-        self.simulator = RadioactiveDecaySimulator()
-        self.setup_styles()
-        self.setup_ui()
-
-    def setup_styles(self):
-        style = ttk.Style()
-        try:
-            style.theme_use('clam')
-        except Exception:
-            pass
-
-        style.configure(
-            'Card.TFrame', background=self.colors['panel1'], relief='flat', borderwidth=0)
-        style.configure('Main.TFrame', background=self.colors['bg'])
-        style.configure('Title.TLabel', background=self.colors['panel1'], foreground=self.colors['text'], font=(
-            'Segoe UI', 11, 'bold'))
-        style.configure('Header.TLabel', background=self.colors['bg'], foreground=self.colors['text'], font=(
-            'Segoe UI', 16, 'bold'))
-        style.configure(
-            'Subtitle.TLabel', background=self.colors['panel1'], foreground=self.colors['info'], font=('Segoe UI', 9))
-
-        style.configure('Modern.TEntry', fieldbackground='#1E2749',
-                        foreground='#FFFFFF', borderwidth=2, insertcolor='#00FF41')
-        style.map('Modern.TEntry', fieldbackground=[
-                  ('readonly', '#2A3654')], foreground=[('readonly', '#AAAAAA')])
-
-        style.configure('Modern.TCombobox', fieldbackground='#1E2749',
-                        foreground='#FFFFFF', borderwidth=2, arrowcolor='#00FF41')
-        style.map('Modern.TCombobox', fieldbackground=[
-                  ('readonly', '#1E2749')], selectbackground=[('readonly', '#0F3460')])
-
-    def create_card(self, parent, title=None, panel_color='panel1'):
-        card = tk.Frame(
-            parent, bg=self.colors[panel_color], relief='flat', borderwidth=0)
-        card.configure(highlightbackground=self.colors['border_neon'],
-                       highlightthickness=2, highlightcolor=self.colors['accent'])
-        if title:
-            title_label = tk.Label(card, text=title, bg=self.colors[panel_color], fg=self.colors['text_neon'], font=(
-                'Segoe UI', 13, 'bold'), anchor='w')
-            title_label.pack(fill='x', padx=20, pady=(15, 10))
-        return card
-
-    def setup_ui(self):
-        main_container = tk.Frame(self.root, bg=self.colors['bg'])
-        main_container.pack(fill='both', expand=True, padx=20, pady=20)
-
-        header_frame = tk.Frame(main_container, bg=self.colors['bg'])
-        header_frame.pack(fill='x', pady=(0, 15))
-
-        title = tk.Label(header_frame, text="☢ RADIOACTIVE DECAY SIMULATOR (PHYSICS)",
-                         bg=self.colors['bg'], fg=self.colors['accent'], font=('Segoe UI', 20, 'bold'))
-        title.pack(anchor='w')
-
-        subtitle = tk.Label(header_frame, text="Real half-life based simulation — 'Balanced' step size: Δt = T₁/₂ / 50",
-                            bg=self.colors['bg'], fg=self.colors['info'], font=('Segoe UI', 10))
-        subtitle.pack(anchor='w', pady=(5, 0))
-
-        content = tk.Frame(main_container, bg=self.colors['bg'])
-        content.pack(fill='both', expand=True)
-
-        left_column = tk.Frame(content, bg=self.colors['bg'])
-        left_column.pack(side='left', fill='both', padx=(0, 10))
-        self.setup_controls(left_column)
-
-        right_column = tk.Frame(content, bg=self.colors['bg'])
-        right_column.pack(side='left', fill='both', expand=True)
-        self.setup_visualization(right_column)
-
-    def setup_controls(self, parent):
-        params_card = self.create_card(
-            parent, "SIMULATION PARAMETERS", 'panel1')
-        params_card.pack(fill='x', pady=(0, 15))
-
-        params_content = tk.Frame(params_card, bg=self.colors['panel1'])
-        params_content.pack(fill='x', padx=20, pady=(0, 20))
-
-        self.create_input_row(
-            params_content, "Select Isotope", 0, is_combobox=True)
-
-        self.rec_label = tk.Label(params_content, text="", bg=self.colors['panel1'], fg=self.colors['warning'], font=(
-            'Segoe UI', 8, 'italic'), justify='left')
-        self.rec_label.pack(fill='x', pady=(0, 10))
-
-        self.create_input_row(params_content, "Half-life", 1)
-        self.create_input_row(
-            params_content, "Number of Atoms", 2, default="1000")
-        self.create_input_row(
-            params_content, "Simulation Steps", 3, default="50")
-
-        button_frame = tk.Frame(params_card, bg=self.colors['panel1'])
-        button_frame.pack(fill='x', padx=20, pady=(10, 20))
-        run_btn = ModernButton(button_frame, "▶ RUN SIMULATION", self.run_simulation,
-                               bg_color=self.colors['accent'], hover_color=self.colors['success'], width=300)
-        run_btn.pack()
-
-        info_card = self.create_card(parent, "QUICK INFO", 'panel2')
-        info_card.pack(fill='both', expand=True)
-        info_content = tk.Frame(info_card, bg=self.colors['panel2'])
-        info_content.pack(fill='both', expand=True, padx=20, pady=(0, 20))
-
-        info_text = (
-            "📚 About Half-Life:\n"
-            "The time required for half of the radioactive atoms to decay.\n\n"
-            "🔬 How it works (physics mode):\n"
-            "We use the exponential decay law. Each step simulates Δt = T₁/₂ / 50\n"
-            "so the decay probability per step is P = 1 - exp(-ln2 * Δt / T₁/₂).\n\n"
-        )
-        info_label = tk.Label(info_content, text=info_text, bg=self.colors['panel2'], fg=self.colors['text'], font=(
-            'Segoe UI', 9), justify='left', anchor='nw')
-        info_label.pack(fill='both', expand=True)
-
-    def create_input_row(self, parent, label_text, row, is_combobox=False, default=""):
-        row_frame = tk.Frame(parent, bg=self.colors['panel1'])
-        row_frame.pack(fill='x', pady=10)
-
-        label = tk.Label(row_frame, text=label_text, bg=self.colors['panel1'], fg=self.colors['info'], font=(
-            'Segoe UI', 10, 'bold'), anchor='w', width=18)
-        label.pack(side='left')
-
-        if is_combobox and label_text == "Select Isotope":
-            self.isotope_var = tk.StringVar()
-            combo = ttk.Combobox(row_frame, textvariable=self.isotope_var, values=list(
-                ISOTOPES.keys()), width=25, state="readonly", font=('Segoe UI', 10), style='Modern.TCombobox')
-            combo.pack(side='left', fill='x', expand=True)
-            combo.current(0)
-            combo.bind("<<ComboboxSelected>>", self.on_isotope_selected)
-            # FIX: Initialize the display on startup
-            self.root.after(100, lambda: self.on_isotope_selected(None))
-        elif label_text == "Half-life":
-            input_frame = tk.Frame(row_frame, bg=self.colors['panel1'])
-            input_frame.pack(side='left', fill='x', expand=True)
-            first_key = list(ISOTOPES.keys())[0]
-            default_val = ISOTOPES[first_key]["half_life"] if ISOTOPES[first_key]["half_life"] is not None else ""
-            self.halflife_var = tk.StringVar(value=str(default_val))
-            self.halflife_entry = ttk.Entry(input_frame, textvariable=self.halflife_var, width=15, font=(
-                'Segoe UI', 10), style='Modern.TEntry', state='readonly')
-            self.halflife_entry.pack(side='left', padx=(0, 5))
-            self.halflife_unit_label = tk.Label(
-                input_frame, text="", bg=self.colors['panel1'], fg=self.colors['warning'], font=('Segoe UI', 9, 'bold'))
-            self.halflife_unit_label.pack(side='left')
-        else:
-            var = tk.StringVar(value=default)
-            if label_text == "Number of Atoms":
-                self.atoms_var = var
-            elif label_text == "Simulation Steps":
-                self.steps_var = var
-            entry = ttk.Entry(row_frame, textvariable=var, width=25, font=(
-                'Segoe UI', 10), style='Modern.TEntry')
-            entry.pack(side='left', fill='x', expand=True)
-
-    def setup_visualization(self, parent):
-        stats_frame = tk.Frame(parent, bg=self.colors['bg'])
-        stats_frame.pack(fill='x', pady=(0, 15))
-
-        self.stats_cards = {}
-        stats_info = [
-            ("REMAINING", "atoms_remaining", self.colors['success'], 'panel1'),
-            ("DECAYED", "atoms_decayed", self.colors['danger'], 'panel2'),
-            ("PROGRESS", "decay_percent", self.colors['info'], 'panel3')
-        ]
-
-        for i, (title, key, color, panel) in enumerate(stats_info):
-            card = self.create_stat_card(stats_frame, title, "—", color, panel)
-            card.pack(side='left', fill='x', expand=True,
-                      padx=(0, 10 if i < 2 else 0))
-            self.stats_cards[key] = card
-
-        viz_card = self.create_card(parent, "DECAY VISUALIZATION", 'panel3')
-        viz_card.pack(fill='both', expand=True)
-        viz_content = tk.Frame(viz_card, bg=self.colors['panel3'])
-        viz_content.pack(fill='both', expand=True, padx=15, pady=(0, 15))
-
-        self.figure = Figure(figsize=(10, 6), dpi=100,
-                             facecolor=self.colors['panel3'])
-        self.canvas = FigureCanvasTkAgg(self.figure, master=viz_content)
-        self.canvas.get_tk_widget().pack(fill='both', expand=True)
-        self.draw_empty_plot()
-
-    def create_stat_card(self, parent, title, value, color, panel_color):
-        card = tk.Frame(parent, bg=self.colors[panel_color], relief='flat',
-                        highlightbackground=color, highlightthickness=3)
-        content = tk.Frame(card, bg=self.colors[panel_color])
-        content.pack(fill='both', expand=True, padx=20, pady=15)
-        title_label = tk.Label(
-            content, text=title, bg=self.colors[panel_color], fg=self.colors['text'], font=('Segoe UI', 9, 'bold'))
-        title_label.pack(anchor='w')
-        value_label = tk.Label(
-            content, text=value, bg=self.colors[panel_color], fg=color, font=('Segoe UI', 22, 'bold'))
-        value_label.pack(anchor='w', pady=(5, 0))
-        card.value_label = value_label
-        return card
-
-    def draw_empty_plot(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111, facecolor=self.colors['panel3'])
-        ax.text(0.5, 0.5, '▶ RUN A SIMULATION TO SEE RESULTS', ha='center', va='center',
-                fontsize=14, color=self.colors['accent'], transform=ax.transAxes, weight='bold')
-        ax.set_xticks([])
-        ax.set_yticks([])
-        for spine in ax.spines.values():
-            spine.set_color(self.colors['border_neon'])
-            spine.set_linewidth(2)
-        self.canvas.draw()
-
-    def on_isotope_selected(self, event):
-        selected = self.isotope_var.get()
-        isotope_data = ISOTOPES[selected]
-        if selected == "Custom":
-            self.halflife_entry.config(state="normal")
-            self.halflife_var.set("")
-            self.halflife_unit_label.config(text=isotope_data["unit"])
-            self.rec_label.config(text="")
-        else:
-            self.halflife_entry.config(state="readonly")
-            half_life = isotope_data["half_life"]
-            if half_life >= 1e6:
-                display_value = f"{half_life:.3e}"
-            elif half_life >= 1000:
-                display_value = f"{half_life:,.0f}"
-            else:
-                display_value = f"{half_life:.2f}"
-            self.halflife_var.set(display_value)
-            self.halflife_unit_label.config(text=isotope_data["unit"])
-
-            half_life_days = to_days(
-                isotope_data["half_life"], isotope_data["unit"])
-            if half_life_days:
-                delta_t_days = half_life_days / 50.0
-                if delta_t_days >= 365.25:
-                    delta_display = f"{delta_t_days/365.25:.2f} years/step"
-                elif delta_t_days >= 1:
-                    delta_display = f"{delta_t_days:.2f} days/step"
-                else:
-                    delta_display = f"{delta_t_days*24:.2f} hours/step"
-                self.rec_label.config(
-                    text=f"✓ Balanced Δt ≈ {delta_display} (Δt = T₁/₂ / 50)")
-            else:
-                self.rec_label.config(text="")
-
-    def run_simulation(self):
-        try:
-            num_atoms = int(self.atoms_var.get())
-            num_steps = int(self.steps_var.get())
-            selected = self.isotope_var.get()
-            isot = ISOTOPES[selected]
-
-            if selected == "Custom":
-                half_life_str = self.halflife_var.get().replace(',', '').strip()
-                if half_life_str == "":
-                    messagebox.showerror(
-                        "Invalid Input", "Enter a half-life for Custom isotope.")
-                    return
-                # FIX: Validate that custom half-life is positive
-                half_life_value = float(half_life_str)
-                if half_life_value <= 0:
-                    messagebox.showerror(
-                        "Invalid Input", "Half-life must be a positive number!")
-                    return
-                half_life_unit = isot["unit"]
-            else:
-                half_life_value = isot["half_life"]
-                half_life_unit = isot["unit"]
-
-            if num_atoms <= 0 or num_steps <= 0:
-                messagebox.showerror(
-                    "Invalid Input", "All values must be positive numbers!")
-                return
-
-            time_steps, remaining, decayed, delta_t_days = self.simulator.run_simulation(
-                num_atoms, half_life_value, half_life_unit, num_steps, balanced_fraction=50
-            )
-
-            self.update_stats(remaining[-1], decayed[-1], num_atoms)
-            self.visualize_decay(time_steps, remaining, decayed, delta_t_days)
-
-        except ValueError as e:
-            messagebox.showerror(
-                "Invalid Input", f"Please enter valid numeric values!\nError: {str(e)}")
-        except Exception as e:
-            messagebox.showerror(
-                "Simulation Error", f"An error occurred during simulation:\n{str(e)}")
-
-    def update_stats(self, remaining, decayed, total):
-        self.stats_cards['atoms_remaining'].value_label.config(
-            text=f"{remaining:,}")
-        self.stats_cards['atoms_decayed'].value_label.config(
-            text=f"{decayed:,}")
-        decay_percent = (decayed/total)*100 if total > 0 else 0
-        self.stats_cards['decay_percent'].value_label.config(
-            text=f"{decay_percent:.1f}%")
-
-    def visualize_decay(self, time_steps, remaining, decayed, delta_t_days):
-        real_times_days = [t * delta_t_days for t in time_steps]
-        max_days = real_times_days[-1] if real_times_days else 0
-
-        if max_days >= 365.25:
-            real_times = [d / 365.25 for d in real_times_days]
-            time_unit = "years"
-        elif max_days >= 1:
-            real_times = real_times_days
-            time_unit = "days"
-        else:
-            real_times = [d * 24 for d in real_times_days]
-            time_unit = "hours"
-
-        self.figure.clear()
-        ax1 = self.figure.add_subplot(2, 1, 1, facecolor=self.colors['panel3'])
-        ax2 = self.figure.add_subplot(2, 1, 2, facecolor=self.colors['panel3'])
-
-        ax1.plot(real_times, remaining, linewidth=3, label='Remaining Atoms', color=self.colors['success'],
-                 marker='o', markersize=5, alpha=0.9, markevery=max(1, len(real_times)//20))
-        ax1.plot(real_times, decayed, linewidth=3, label='Decayed Atoms', color=self.colors['danger'],
-                 marker='s', markersize=5, alpha=0.9, markevery=max(1, len(real_times)//20))
-
-        ax1.fill_between(real_times, remaining, alpha=0.3,
-                         color=self.colors['success'])
-        ax1.fill_between(real_times, decayed, alpha=0.3,
-                         color=self.colors['danger'])
-
-        ax1.set_xlabel(f'Time ({time_unit})', fontsize=10, weight='bold')
-        ax1.set_ylabel('Number of Atoms', fontsize=10, weight='bold')
-        ax1.set_title('Radioactive Decay Over Time (Physics-based)',
-                      fontsize=12, fontweight='bold', color=self.colors['accent'], pad=15)
-        ax1.legend(loc='best', frameon=True, shadow=False, fontsize=9,
-                   facecolor=self.colors['panel3'], edgecolor=self.colors['border_neon'], labelcolor='white')
-        ax1.grid(True, alpha=0.3, linestyle='--', color=self.colors['info'])
-        for spine in ax1.spines.values():
-            spine.set_color(self.colors['border_neon'])
-            spine.set_linewidth(1.5)
-
-        # FIX: Corrected decay_per_step calculation
-        decay_per_step = [decayed[i] - decayed[i-1] if i >
-                          0 else decayed[0] for i in range(len(decayed))]
-
-        # Calculate proper width for bars based on data range
-        if len(real_times) > 1:
-            bar_width = (real_times[1] - real_times[0]) * 0.8
-        else:
-            bar_width = 1
+    def run_simulation(self, num_atoms, half_life_value, half_life_unit, num_steps, balanced_fraction=50):
+        args = (num_atoms, half_life_value, half_life_unit,
+                num_steps, balanced_fraction)
+        cached = self.get_cached_run(*args)
+        if cached is not None:
+            return cached
+
+        records = self.iter_simulation(*args)
+        next(records)  # Step 0 is already recorded by initialize()
 
-        ax2.bar(real_times, decay_per_step, width=bar_width, alpha=0.8,
-                color=self.colors['warning'], edgecolor=self.colors['accent'], linewidth=1.5)
+        for step, remaining, decayed, _ in records:
+            self.remaining_atoms.append(remaining)
+            self.decayed_atoms.append(decayed)
+            self.time_steps.append(step)
 
-        ax2.set_xlabel(f'Time ({time_unit})', fontsize=10, weight='bold')
-        ax2.set_ylabel('Atoms Decayed', fontsize=10, weight='bold')
-        ax2.set_title('Decay Rate per Time Step', fontsize=12,
-                      fontweight='bold', color=self.colors['warning'], pad=15)
-        ax2.grid(True, alpha=0.3, axis='y',
-                 linestyle='--', color=self.colors['info'])
-        for spine in ax2.spines.values():
-            spine.set_color(self.colors['border_neon'])
-            spine.set_linewidth(1.5)
+        self.cache_run(*args)
+        return self.time_steps, self.remaining_atoms, self.decayed_atoms, self.delta_t_days
 
-        self.figure.tight_layout()
-        self.canvas.draw()
+    def _cache_key(self, num_atoms, half_life_value, half_life_unit, num_steps, balanced_fraction):
+        seed = self.seed
+        if isinstance(seed, np.random.SeedSequence):
+            seed = (str(seed.entropy), tuple(seed.spawn_key))
+        return (float(to_days(half_life_value, half_life_unit)), half_life_unit.lower(),
+                int(num_atoms), int(num_steps), float(balanced_fraction), seed, self.engine,
+                self.rng_backend)
+
+    def get_cached_run(self, num_atoms, half_life_value, half_life_unit, num_steps, balanced_fraction=50):
+        """Restore a cached run into this simulator; returns run_simulation's tuple or None."""
+        # An unseeded run must draw a new sample each time, so never replays one
+        if self.cache is None or self.seed is None:
+            return None
+        entry = self.cache.get(self._cache_key(
+            num_atoms, half_life_value, half_life_unit, num_steps, balanced_fraction))
+        if entry is None:
+            return None
+
+        # Per-atom and RNG state are not cached; the series and decay log
+        # are. Clear what a previous run left, which the hit did not produce
+        self.atoms = None
+        self.rng = None
+        self.times_days = None
+        self.num_atoms = num_atoms
+        self.delta_t_days = float(entry['delta_t_days'])
+        self.time_steps = entry['time_steps'].tolist()
+        self.remaining_atoms = entry['remaining_atoms'].tolist()
+        self.decayed_atoms = entry['decayed_atoms'].tolist()
+        self.current_remaining = self.remaining_atoms[-1]
+        self.decay_list = (DecayLog.from_records(entry['decays'])
+                           if 'decays' in entry else None)
+        return self.time_steps, self.remaining_atoms, self.decayed_atoms, self.delta_t_days
 
+    def cache_run(self, num_atoms, half_life_value, half_life_unit, num_steps, balanced_fraction=50):
+        """Store the series currently held by the simulator under these parameters."""
+        if self.cache is None or self.seed is None:
+            return
+        entry = {
+            'delta_t_days': np.float64(self.delta_t_days),
+            'time_steps': np.asarray(self.time_steps, dtype=np.int64),
+            'remaining_atoms': np.asarray(self.remaining_atoms, dtype=np.int64),
+            'decayed_atoms': np.asarray(self.decayed_atoms, dtype=np.int64),
+        }
+        if self.decay_list is not None:
+            entry['decays'] = self.decay_list.get_all_decays().copy()
+        self.cache.put(self._cache_key(
+            num_atoms, half_life_value, half_life_unit, num_steps, balanced_fraction), entry)
+
+
+class SimulationCache:
+    """LRU cache of simulation results bounded by bytes, with an optional disk tier.
+
+    Entries are dicts of NumPy arrays. Evicted entries stay available from
+    ``disk_dir`` when one is given, since every entry is written through to
+    it. Only seeded runs are cached (RadioactiveDecaySimulator skips the
+    cache without a seed), as rerunning an unseeded run must draw a new
+    sample.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+    @staticmethod
+    def _entry_bytes(entry):
+        return sum(value.nbytes for value in entry.values())
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.disk_dir, digest + ".npz")
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        if self.disk_dir is not None and os.path.exists(self._disk_path(key)):
+            with np.load(self._disk_path(key)) as data:
+                entry = {name: data[name] for name in data.files}
+            with self._lock:
+                self.hits += 1
+                self.disk_hits += 1
+                self._insert(key, entry)
+            return entry
+        with self._lock:
+            self.misses += 1
+        return None
 
-def main():
-    root = tk.Tk()
-    app = DecayVisualizerApp(root)
-    root.mainloop()
+    def put(self, key, entry):
+        with self._lock:
+            self._insert(key, entry)
+        if self.disk_dir is not None:
+            write_atomically(self._disk_path(key), lambda f: np.savez(f, **entry), mode="wb")
+
+    def _insert(self, key, entry):
+        size = self._entry_bytes(entry)
+        if key in self._entries:
+            self.current_bytes -= self._entry_bytes(self._entries.pop(key))
+        if size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= self._entry_bytes(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'disk_hits': self.disk_hits,
+                    'entries': len(self._entries), 'bytes': self.current_bytes}
+
+
+# Percentiles are read from per-step histograms spanning the binomial
+# mean ± ENSEMBLE_SPAN standard deviations, so workers never ship trajectories
+ENSEMBLE_BINS = 512
+ENSEMBLE_SPAN = 10.0
+
+
+def _ensemble_bins(num_atoms, decay_prob, num_steps):
+    """Per-step histogram origin, bin width and expected remaining count."""
+    expected, _, sigma = RadioactiveDecaySimulator().calculate_expected_decay(
+        num_atoms, decay_prob, num_steps)
+    low = np.maximum(expected - ENSEMBLE_SPAN * sigma - 1.0, 0.0)
+    high = np.minimum(expected + ENSEMBLE_SPAN * sigma + 1.0, num_atoms)
+    width = np.maximum(high - low, 1.0) / ENSEMBLE_BINS
+    return low, width, expected
+
+
+def _run_ensemble_batch(seeds, decay_prob, engine, num_atoms, half_life_value,
+                        half_life_unit, num_steps, balanced_fraction):
+    """Run a batch of trials in a worker and reduce them to summary arrays."""
+    # Only the remaining counts are reduced, so no decay log is kept
+    simulator = RadioactiveDecaySimulator(engine=engine, keep_decay_log=False)
+    low, width, expected = _ensemble_bins(num_atoms, decay_prob, num_steps)
+    sums = np.zeros(num_steps + 1)
+    squares = np.zeros(num_steps + 1)
+    hist = np.zeros((num_steps + 1, ENSEMBLE_BINS), dtype=np.int64)
+    rows = np.arange(num_steps + 1)
+    trajectory = np.zeros(num_steps + 1)
+
+    for seed in seeds:
+        simulator.seed = seed
+        # Runs stop early once every atom has decayed; the rest stays at 0
+        trajectory[:] = 0
+        for chunk in simulator.iter_simulation(
+                num_atoms, half_life_value, half_life_unit, num_steps,
+                balanced_fraction, chunk_size=4096):
+            trajectory[chunk[:, 0]] = chunk[:, 1]
+        # Shift by the expected curve to keep the sums well conditioned
+        deviation = trajectory - expected
+        sums += deviation
+        squares += deviation * deviation
+        bins = np.clip(((trajectory - low) / width).astype(np.int64),
+                       0, ENSEMBLE_BINS - 1)
+        hist[rows, bins] += 1
+
+    return len(seeds), sums, squares, hist
+
+
+def _histogram_percentile(hist, low, width, q):
+    cdf = np.cumsum(hist, axis=1)
+    target = cdf[:, -1] * q / 100.0
+    bin_index = np.minimum((cdf < target[:, None]).sum(axis=1),
+                           hist.shape[1] - 1)
+    rows = np.arange(hist.shape[0])
+    before = np.where(bin_index > 0, cdf[rows, bin_index - 1], 0)
+    inside = np.maximum(hist[rows, bin_index], 1)
+    fraction = np.clip((target - before) / inside, 0.0, 1.0)
+    return low + width * (bin_index + fraction)
+
+
+def run_ensemble(num_trials, num_atoms, half_life_value, half_life_unit, num_steps,
+                 balanced_fraction=50, engine="binomial", seed=None,
+                 percentiles=(5, 50, 95), max_workers=None):
+    """Run independent Monte Carlo trials across processes.
+
+    Every trial gets its own stream spawned from ``SeedSequence(seed)``, so
+    an ensemble is reproducible for a given seed whatever the worker count.
+    Workers reduce their trials to sums and per-step histograms; the result
+    holds per-step mean, std and percentile arrays rather than trajectories.
+    """
+    if num_trials <= 0:
+        raise ValueError("Number of trials must be positive.")
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Unknown engine '{engine}'. Choose from: {', '.join(ENGINES)}.")
+
+    delta_t_days, decay_prob = RadioactiveDecaySimulator().calculate_step_size(
+        half_life_value, half_life_unit, balanced_fraction)
+
+    seeds = np.random.SeedSequence(seed).spawn(num_trials)
+    max_workers = max_workers or os.cpu_count() or 1
+    # A few batches per worker keeps the pool busy without shipping one
+    # task per trial
+    num_batches = min(num_trials, max_workers * 4)
+    batches = [seeds[i::num_batches] for i in range(num_batches)]
+    job_args = (decay_prob, engine, num_atoms, half_life_value, half_life_unit,
+                num_steps, balanced_fraction)
+
+    total = 0
+    sums = np.zeros(num_steps + 1)
+    squares = np.zeros(num_steps + 1)
+    hist = np.zeros((num_steps + 1, ENSEMBLE_BINS), dtype=np.int64)
+
+    def merge(batch_result):
+        nonlocal total, sums, squares, hist
+        count, batch_sums, batch_squares, batch_hist = batch_result
+        total += count
+        sums += batch_sums
+        squares += batch_squares
+        hist += batch_hist
+
+    if max_workers == 1:
+        for batch in batches:
+            merge(_run_ensemble_batch(batch, *job_args))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_run_ensemble_batch, batch, *job_args)
+                       for batch in batches]
+            for future in as_completed(futures):
+                merge(future.result())
+
+    low, width, expected = _ensemble_bins(num_atoms, decay_prob, num_steps)
+    mean_deviation = sums / total
+    mean_remaining = expected + mean_deviation
+    variance = np.maximum(squares / total - mean_deviation ** 2, 0.0)
+    remaining_percentiles = {
+        q: _histogram_percentile(hist, low, width, q) for q in percentiles}
+
+    return {
+        'time_steps': np.arange(num_steps + 1),
+        'delta_t_days': delta_t_days,
+        'num_trials': total,
+        'engine': engine,
+        'mean_remaining': mean_remaining,
+        'mean_decayed': num_atoms - mean_remaining,
+        'std': np.sqrt(variance),
+        'remaining_percentiles': remaining_percentiles,
+        'decayed_percentiles': {
+            q: num_atoms - _histogram_percentile(hist, low, width, 100 - q)
+            for q in percentiles},
+    }
+
+
+def minmax_decimate(x, y, num_buckets):
+    """Reduce (x, y) to the min and max point of each of num_buckets buckets.
+
+    Keeps every peak and trough a pixel column could show, plus the first and
+    last point, so a line drawn from the result looks like the full series at
+    roughly 2 * num_buckets points. Short series are returned unchanged.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    num_buckets = max(int(num_buckets), 1)
+    if n <= 2 * num_buckets:
+        return x, y
+
+    bucket_size = -(-n // num_buckets)
+    num_buckets = -(-n // bucket_size)
+    # Pad the tail with its last value so the buckets form a rectangle
+    padded = np.empty(num_buckets * bucket_size, dtype=y.dtype)
+    padded[:n] = y
+    padded[n:] = y[-1]
+    buckets = padded.reshape(num_buckets, bucket_size)
+    offsets = np.arange(num_buckets) * bucket_size
+    lows = offsets + buckets.argmin(axis=1)
+    highs = offsets + buckets.argmax(axis=1)
+
+    keep = np.concatenate(([0], lows, highs, [n - 1]))
+    keep = np.unique(np.minimum(keep, n - 1))
+    return x[keep], y[keep]
+
+
+# The GUI lives in decay_visualizer_gui and is only imported when needed, so
+# headless use never pays for tkinter/matplotlib
+_GUI_NAMES = ("DecayVisualizerApp", "ModernButton")
+
+
+def __getattr__(name):
+    if name in _GUI_NAMES:
+        import decay_visualizer_gui
+        return getattr(decay_visualizer_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _count(value):
+    """argparse type for atom/step counts; accepts forms like 1e8."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid count: {value!r}")
+    if number <= 0 or number != int(number):
+        raise argparse.ArgumentTypeError(
+            f"count must be a positive whole number: {value!r}")
+    return int(number)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="radioactive_decay_visualizer",
+        description="Radioactive decay simulator. Without a command the GUI starts.")
+    commands = parser.add_subparsers(dest="command")
+
+    commands.add_parser("gui", help="start the desktop application")
+
+    simulate = commands.add_parser(
+        "simulate", help="run one simulation headless and print the results")
+    simulate.add_argument("--isotope", default="Carbon-14", choices=list(ISOTOPES),
+                          metavar="NAME", help="isotope from the built-in table")
+    simulate.add_argument("--half-life", type=float,
+                          help="half-life value (required for Custom)")
+    simulate.add_argument("--unit", help="half-life unit, e.g. years or days")
+    simulate.add_argument("--atoms", type=_count, default=1000)
+    simulate.add_argument("--steps", type=_count, default=50)
+    simulate.add_argument("--fraction", type=float, default=50,
+                          help="steps per half-life (Δt = T½ / fraction)")
+    simulate.add_argument("--engine", choices=ENGINES, default="numpy")
+    simulate.add_argument("--seed", type=int)
+    simulate.add_argument("--rng", choices=RNG_BACKENDS,
+                          help="random number backend (default: stdlib for python, "
+                               "counter with --threads, pcg64 otherwise)")
+    simulate.add_argument("--threads", type=int, default=1,
+                          help="threads stepping chunks of the numpy engine's atoms in parallel")
+    simulate.add_argument("--adaptive", action="store_true",
+                          help="cover the span of --steps balanced steps with adaptive Δt")
+    simulate.add_argument("--tolerance", type=float, default=0.05,
+                          help="largest relative change per adaptive step")
+    simulate.add_argument("--decay-log",
+                          help="write the per-atom decay log to this memory-mapped file")
+    simulate.add_argument("--export",
+                          help="save the series, decay log and metadata as .npy columns in this directory")
+    simulate.add_argument("--checkpoint",
+                          help="checkpoint the run to this directory, resuming from it if it holds one")
+    simulate.add_argument("--checkpoint-interval", type=float, default=60.0,
+                          help="minimum seconds between checkpoints")
+    simulate.add_argument("--cache-dir",
+                          help="with --seed, reuse results of identical runs stored in this "
+                               "directory (ignored for unseeded runs and with --decay-log)")
+    simulate.add_argument("--series", action="store_true",
+                          help="print every step as CSV instead of a summary")
+    simulate.add_argument("--timing", action="store_true",
+                          help="report cold start and run time on stderr")
+
+    sweep = commands.add_parser(
+        "sweep", help="run a parameter sweep described by a JSON grid spec")
+    sweep.add_argument("--spec", required=True,
+                       help="JSON file with isotopes, atoms, balanced_fractions, steps, engine, seed")
+    sweep.add_argument("--out", required=True,
+                       help="output directory; rerunning skips finished jobs")
+    sweep.add_argument("--workers", type=int)
+
+    chain = commands.add_parser(
+        "chain", help="follow a parent and its daughters through a decay chain")
+    chain.add_argument("--isotope", default="Radium-226", choices=[*ISOTOPES, *CHAIN_NUCLIDES],
+                       metavar="NAME", help="parent isotope of the chain")
+    chain.add_argument("--atoms", type=_count, default=10 ** 9)
+    chain.add_argument("--steps", type=_count, default=50)
+    chain.add_argument("--fraction", type=float, default=50,
+                       help="steps per parent half-life (Δt = T½ / fraction)")
+    chain.add_argument("--mode", choices=("stochastic", "bateman"), default="stochastic")
+    chain.add_argument("--seed", type=int)
+    chain.add_argument("--adaptive", action="store_true",
+                       help="cover the span of --steps parent steps with adaptive Δt")
+    chain.add_argument("--tolerance", type=float, default=0.05,
+                       help="largest relative change per adaptive step")
+    return parser
+
+
+def _isotope_half_life(args):
+    isotope = ISOTOPES[args.isotope]
+    half_life_value = args.half_life if args.half_life is not None else isotope["half_life"]
+    half_life_unit = args.unit or isotope["unit"]
+    if half_life_value is None or half_life_value <= 0:
+        raise ValueError("Half-life must be a positive number!")
+    return half_life_value, half_life_unit
+
+
+# Steps buffered between writes when a CLI run is exported
+EXPORT_CHUNK_STEPS = 4096
+
+
+def _write_export_rows(writer, rows, adaptive, decay_log):
+    if rows:
+        steps, times_days, remaining, decayed, _ = zip(*rows)
+        writer.write_series(steps, remaining, decayed, times_days if adaptive else None)
+        writer.write_new_decays(decay_log)
+        rows.clear()
+
+
+def run_simulate_command(args, out=sys.stdout):
+    half_life_value, half_life_unit = _isotope_half_life(args)
+    # Only a seeded run has one right answer to reuse. A run asked for a
+    # --decay-log file must write it, and its log is not worth copying into
+    # the cache, so it skips the cache
+    cache = (SimulationCache(disk_dir=args.cache_dir)
+             if args.cache_dir and args.seed is not None and args.decay_log is None
+             else None)
+    simulator = RadioactiveDecaySimulator(
+        engine=args.engine, seed=args.seed, cache=cache, rng_backend=args.rng,
+        decay_log_path=args.decay_log, threads=args.threads)
+    run_args = (args.atoms, half_life_value, half_life_unit,
+                args.steps, args.fraction)
+
+    run = None
+    if args.checkpoint and (args.adaptive or cache is not None):
+        raise ValueError("--checkpoint works with fixed steps and without --cache-dir.")
+
+    run_start = time.perf_counter()
+    if args.checkpoint:
+        import decay_checkpoint
+        run = decay_checkpoint.CheckpointedRun(
+            simulator, args.checkpoint, *run_args,
+            interval_seconds=args.checkpoint_interval)
+        records = ((step, step * simulator.delta_t_days, *rest)
+                   for step, *rest in run)
+    elif args.adaptive:
+        delta_t_days, _ = simulator.calculate_step_size(
+            half_life_value, half_life_unit, args.fraction)
+        records = simulator.iter_adaptive(
+            args.atoms, half_life_value, half_life_unit, args.steps * delta_t_days,
+            tolerance=args.tolerance, balanced_fraction=args.fraction)
+    elif cache is None:
+        records = ((step, step * simulator.delta_t_days, *rest)
+                   for step, *rest in simulator.iter_simulation(*run_args))
+    else:
+        # The cache needs the whole series, so this path does not stream
+        time_steps, remaining, decayed, _ = simulator.run_simulation(*run_args)
+        records = zip(time_steps, (step * simulator.delta_t_days for step in time_steps),
+                      remaining, decayed, np.diff(decayed, prepend=0).tolist())
+
+    writer = None
+    if args.export:
+        import decay_export
+        writer = decay_export.RunWriter(args.export, adaptive=args.adaptive,
+                                        with_decays=args.engine != "binomial")
+        pending = []
+
+    first_result = None
+    if args.series:
+        out.write("step,time_days,remaining,decayed,newly_decayed\n")
+    for record in records:
+        step = record[0]
+        if first_result is None and step == 1:
+            first_result = time.perf_counter()
+        if args.series:
+            out.write(f"{step},{record[1]:.10g},"
+                      f"{record[2]},{record[3]},{record[4]}\n")
+        if writer is not None:
+            if run is not None and not pending and run.resumed_from == step:
+                # A resumed run starts at its checkpoint, but decays.npy gets
+                # the whole log, so the series must cover the earlier steps too
+                earlier = run.read_series(stop=step)
+                writer.write_series(earlier[:, 0], earlier[:, 1], earlier[:, 2])
+            pending.append(record)
+            if len(pending) >= EXPORT_CHUNK_STEPS:
+                _write_export_rows(writer, pending, args.adaptive, simulator.decay_list)
+        last = record
+    run_end = time.perf_counter()
+    if writer is not None:
+        _write_export_rows(writer, pending, args.adaptive, simulator.decay_list)
+        writer.close(decay_export.run_metadata(simulator, args.isotope, half_life_value,
+                                               half_life_unit, args.fraction),
+                     simulator.decay_list)
+    if isinstance(simulator.decay_list, MappedDecayLog):
+        simulator.decay_list.close()
+
+    if not args.series:
+        step, time_days, remaining, decayed, _ = last
+        out.write(f"isotope: {args.isotope}\n"
+                  f"engine: {args.engine}\n"
+                  f"rng: {simulator.rng_backend}\n"
+                  f"delta_t_days: {simulator.delta_t_days!r}\n"
+                  f"steps: {step}\n"
+                  f"time_days: {time_days:.10g}\n"
+                  f"remaining: {remaining}\n"
+                  f"decayed: {decayed}\n"
+                  f"decay_percent: {100.0 * decayed / args.atoms:.4f}\n")
+        if run is not None and run.resumed_from is not None:
+            out.write(f"resumed_from: {run.resumed_from}\n")
+
+    if args.timing:
+        first_result = first_result or run_end
+        sys.stderr.write(
+            f"cold start to first result: {first_result - _MODULE_START:.4f} s\n"
+            f"import to run start: {run_start - _MODULE_START:.4f} s\n"
+            f"simulation: {run_end - run_start:.4f} s\n")
+        if run is not None:
+            sys.stderr.write(f"checkpoints: {run.checkpoints} "
+                             f"({run.checkpoint_seconds:.4f} s)\n")
+    return 0
+
+
+def run_sweep_command(args, out=sys.stdout):
+    import json
+    import decay_sweep
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    total = len(decay_sweep.expand_grid(spec))
+
+    def progress(job, manifest):
+        out.write(f"[{len(manifest['jobs'])}/{total}] {job['id']}\n")
+        out.flush()
+
+    decay_sweep.run_sweep(spec, args.out, max_workers=args.workers,
+                          progress=progress)
+    return 0
+
+
+def run_chain_command(args, out=sys.stdout):
+    import decay_chains
+
+    simulator = decay_chains.DecayChainSimulator(args.isotope, seed=args.seed)
+    if args.adaptive:
+        records = simulator.iter_adaptive(
+            args.atoms, args.steps * simulator.default_step_days(args.fraction),
+            tolerance=args.tolerance, mode=args.mode)
+    else:
+        records = ((step, step * simulator.delta_t_days, populations)
+                   for step, populations in simulator.iter_simulation(
+                       args.atoms, args.steps, balanced_fraction=args.fraction,
+                       mode=args.mode))
+    out.write("step,time_days," + ",".join(simulator.species) + "\n")
+    for step, time_days, populations in records:
+        values = ",".join(f"{count:.10g}" for count in populations.tolist())
+        out.write(f"{step},{time_days:.10g},{values}\n")
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command in (None, "gui"):
+        import decay_visualizer_gui
+        decay_visualizer_gui.main()
+        return 0
+    try:
+        if args.command == "sweep":
+            return run_sweep_command(args)
+        if args.command == "chain":
+            return run_chain_command(args)
+        return run_simulate_command(args)
+    except ValueError as e:
+        sys.stderr.write(f"error: {e}\n")
+        return 2
 
 
 if __name__ == "__main__":
-    main()
+    # The helper modules import this one by name; run as a script or with
+    # python -m it is __main__, and they would load a second copy with its
+    # own classes and constants
+    sys.modules.setdefault("radioactive_decay_visualizer", sys.modules[__name__])
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import queue
+import threading
+
+import numpy as np
+
+from decay_shared import WORKER_ENGINE, SharedRunBuffers, run_worker
+from radioactive_decay_visualizer import RadioactiveDecaySimulator, SimulationCache
+
+RUN = (2000, 8.02, "days", 40, 50)
+
+
+def test_seeded_rerun_is_served_from_the_cache():
+    cache = SimulationCache()
+    first = RadioactiveDecaySimulator(seed=5, cache=cache)
+    expected = first.run_simulation(*RUN)
+    second = RadioactiveDecaySimulator(seed=5, cache=cache)
+    assert second.run_simulation(*RUN) == expected
+    assert cache.hits == 1
+    assert np.array_equal(second.decay_list.get_all_decays(),
+                          first.decay_list.get_all_decays())
+
+
+def test_unseeded_runs_are_not_cached():
+    cache = SimulationCache()
+    simulator = RadioactiveDecaySimulator(cache=cache)
+    simulator.run_simulation(*RUN)
+    simulator.run_simulation(*RUN)
+    assert len(cache._entries) == 0 and cache.hits == 0
+
+
+def test_cache_key_separates_engines_and_backends():
+    cache = SimulationCache()
+    RadioactiveDecaySimulator("binomial", seed=5, cache=cache).run_simulation(*RUN)
+    numpy_run = RadioactiveDecaySimulator("numpy", seed=5, cache=cache)
+    numpy_run.run_simulation(*RUN)
+    assert cache.hits == 0
+    assert numpy_run.decay_list is not None
+    RadioactiveDecaySimulator("numpy", seed=5, rng_backend="philox",
+                              cache=cache).run_simulation(*RUN)
+    assert cache.hits == 0
+
+
+def test_cache_hit_clears_state_of_the_previous_run():
+    cache = SimulationCache()
+    RadioactiveDecaySimulator(seed=5, cache=cache).run_simulation(*RUN)
+    simulator = RadioactiveDecaySimulator(seed=5, cache=cache)
+    simulator.run_adaptive(1000, 8.02, "days", 100.0)
+    simulator.run_simulation(*RUN)
+    assert cache.hits == 1
+    assert simulator.times_days is None and simulator.rng is None
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    RadioactiveDecaySimulator(seed=5, cache=SimulationCache(disk_dir=str(tmp_path))
+                              ).run_simulation(*RUN)
+    cache = SimulationCache(disk_dir=str(tmp_path))
+    RadioactiveDecaySimulator(seed=5, cache=cache).run_simulation(*RUN)
+    assert cache.disk_hits == 1
+
+
+def test_gui_cache_key_matches_what_the_worker_ran():
+    # The GUI caches the worker's series under a simulator built with
+    # WORKER_ENGINE; that simulator must produce the same series itself
+    num_atoms, half_life_value, half_life_unit, num_steps, _ = RUN
+    buffers = SharedRunBuffers.create(num_steps + 1)
+    messages = queue.Queue()
+    run_worker(buffers.spec, num_atoms, half_life_value, half_life_unit, num_steps, False,
+               messages, threading.Event(), seed=9)
+    final = messages.queue[-1]
+    assert final[0] == "done"
+    count = final[2]
+    rows = buffers.columns(0, count)
+    worker_remaining = rows["remaining"].tolist()
+    del rows
+    buffers.release()
+
+    gui_simulator = RadioactiveDecaySimulator(engine=WORKER_ENGINE, seed=9)
+    _, remaining, _, _ = gui_simulator.run_simulation(*RUN)
+    assert remaining == worker_remaining
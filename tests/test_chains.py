@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from decay_chains import NUCLIDES, DecayChainSimulator, build_decay_chain
+from decay_sweep import expand_grid
+from radioactive_decay_visualizer import CHAIN_NUCLIDES, ISOTOPES
+
+
+def test_chain_members_stay_out_of_the_isotope_list():
+    assert not set(CHAIN_NUCLIDES) & set(ISOTOPES)
+    spec = {"isotopes": "all", "atoms": [10], "balanced_fractions": [50], "steps": 5}
+    named = [name for name, data in ISOTOPES.items() if data["half_life"] is not None]
+    assert len(expand_grid(spec)) == len(named)
+
+
+def test_uranium_series_reaches_lead_206():
+    species, decay_constants, branching = build_decay_chain("Uranium-238")
+    assert species[0] == "Uranium-238" and species[-1] == "Lead-206"
+    assert set(species[1:-1]) <= set(NUCLIDES)
+    assert decay_constants[-1] == 0
+    assert np.allclose(branching[:-1].sum(axis=1), 1.0)
+
+
+@pytest.mark.parametrize("mode", ["stochastic", "bateman"])
+def test_chain_conserves_atoms(mode):
+    simulator = DecayChainSimulator("Radium-226", seed=3)
+    _, populations, _ = simulator.run_simulation(10 ** 6, 50, mode=mode)
+    assert np.allclose(populations.sum(axis=1), 10 ** 6)
+
+
+def test_stochastic_chain_follows_bateman():
+    stochastic = DecayChainSimulator("Strontium-90", seed=3)
+    _, sampled, _ = stochastic.run_simulation(10 ** 8, 20, mode="stochastic")
+    _, expected, _ = DecayChainSimulator("Strontium-90").run_simulation(
+        10 ** 8, 20, mode="bateman")
+    assert np.allclose(sampled, expected, rtol=0.01, atol=2e3)
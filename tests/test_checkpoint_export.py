@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import decay_checkpoint
+import decay_export
+from radioactive_decay_visualizer import RadioactiveDecaySimulator
+
+RUN = (20000, 8.02, "days", 300)
+
+
+def _reference():
+    simulator = RadioactiveDecaySimulator(seed=21)
+    _, remaining, decayed, _ = simulator.run_simulation(*RUN)
+    return remaining, decayed, simulator.decay_list.get_all_decays().copy()
+
+
+@pytest.mark.parametrize("stop_at", [1, 57, 200])
+def test_resumed_run_is_bit_identical(tmp_path, stop_at):
+    checkpoint_dir = str(tmp_path / "ckpt")
+    run = decay_checkpoint.CheckpointedRun(
+        RadioactiveDecaySimulator(seed=21), checkpoint_dir, *RUN, interval_seconds=0)
+    for step, *_ in run:
+        if step == stop_at:
+            break
+    assert run.checkpoints >= 1
+
+    simulator = RadioactiveDecaySimulator(seed=21)
+    resumed = decay_checkpoint.CheckpointedRun(simulator, checkpoint_dir, *RUN)
+    _, remaining, decayed, _ = resumed.run_to_end()
+    assert resumed.resumed_from == stop_at
+    ref_remaining, ref_decayed, ref_log = _reference()
+    assert remaining == ref_remaining and decayed == ref_decayed
+    assert np.array_equal(simulator.decay_list.get_all_decays(), ref_log)
+    simulator.decay_list.close()
+
+
+def test_checkpoint_rejects_another_run(tmp_path):
+    checkpoint_dir = str(tmp_path / "ckpt")
+    decay_checkpoint.CheckpointedRun(
+        RadioactiveDecaySimulator(seed=21), checkpoint_dir, *RUN).run_to_end()
+    with pytest.raises(ValueError):
+        decay_checkpoint.CheckpointedRun(
+            RadioactiveDecaySimulator(seed=22), checkpoint_dir, *RUN).run_to_end()
+
+
+def test_export_round_trip(tmp_path):
+    simulator = RadioactiveDecaySimulator(seed=21)
+    time_steps, remaining, decayed, _ = simulator.run_simulation(*RUN)
+    metadata = decay_export.export_run(simulator, str(tmp_path / "run"), "Iodine-131",
+                                       8.02, "days", 50)
+    loaded_metadata, columns = decay_export.load_run(str(tmp_path / "run"))
+    assert loaded_metadata["seed"] == metadata["seed"] == 21
+    assert loaded_metadata["delta_t_days"] == metadata["delta_t_days"]
+    assert np.array_equal(columns["time_steps"], time_steps)
+    assert np.array_equal(columns["remaining"], remaining)
+    assert np.array_equal(columns["decayed"], decayed)
+    log = decay_export.load_decay_log(str(tmp_path / "run"))
+    assert np.array_equal(log.get_all_decays(), simulator.decay_list.get_all_decays())
+    assert log.get_decay_count_at_step(5) == simulator.decay_list.get_decay_count_at_step(5)
+
+
+def test_streamed_export_matches_a_full_run(tmp_path):
+    decay_export.stream_run(RadioactiveDecaySimulator(seed=21), str(tmp_path / "run"),
+                            *RUN, chunk_size=7)
+    _, columns = decay_export.load_run(str(tmp_path / "run"))
+    ref_remaining, _, ref_log = _reference()
+    assert np.array_equal(columns["remaining"], ref_remaining)
+    assert np.array_equal(columns["decays"], ref_log)
+
+
+def test_export_refuses_a_finished_directory(tmp_path):
+    simulator = RadioactiveDecaySimulator(seed=21)
+    simulator.run_simulation(*RUN)
+    decay_export.export_run(simulator, str(tmp_path / "run"))
+    with pytest.raises(ValueError):
+        decay_export.export_run(simulator, str(tmp_path / "run"))
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from radioactive_decay_visualizer import DECAY_RECORD, DecayLog, MappedDecayLog
+
+
+class SmallChunkLog(DecayLog):
+    CHUNK_SIZE = 7
+
+
+def _fill(log, rng, num_steps=200):
+    """Append random bursts (one by one and in batches); return the expected records."""
+    expected = []
+    step = 0
+    for _ in range(num_steps):
+        ids = rng.integers(0, 1000, int(rng.integers(0, 20))).astype(np.uint32)
+        if rng.random() < 0.3:
+            for atom_id in ids:
+                log.append(int(atom_id), step)
+        else:
+            log.extend(ids, step)
+        expected += [(int(atom_id), step) for atom_id in ids]
+        step += int(rng.integers(0, 3))
+    return np.array(expected, dtype=DECAY_RECORD), step
+
+
+def test_queries_across_chunks_match_the_records():
+    log = SmallChunkLog()
+    records, last_step = _fill(log, np.random.default_rng(0))
+    steps = records['decay_step']
+    for step in range(last_step + 1):
+        assert np.array_equal(log.get_decays_at_step(step), records[steps == step])
+        assert log.get_decay_count_at_step(step) == np.count_nonzero(steps == step)
+        assert np.array_equal(log.get_decays_in_step_range(step, step + 3),
+                              records[(steps >= step) & (steps <= step + 3)])
+    assert np.array_equal(log.get_decays_since(100), records[100:])
+    assert np.array_equal(log.get_all_decays(), records)
+
+
+def test_reads_never_consolidate_the_chunks():
+    log = SmallChunkLog()
+    log.extend(np.arange(5, dtype=np.uint32), 0)
+    log.extend(np.arange(5, 10, dtype=np.uint32), 0)
+    assert len(log._chunks) == 2
+    straddling = log.get_decays_at_step(0)
+    assert np.array_equal(straddling['atom_id'], np.arange(10))
+    log.get_all_decays()
+    assert len(log._chunks) == 2
+    assert log.nbytes == 14 * DECAY_RECORD.itemsize
+    assert not straddling.flags.writeable
+
+
+def test_query_inside_one_chunk_is_a_view():
+    log = DecayLog()
+    log.extend(np.arange(10, dtype=np.uint32), 0)
+    log.extend(np.arange(10, dtype=np.uint32), 1)
+    view = log.get_decays_at_step(1)
+    assert np.shares_memory(view, log._chunks[0])
+
+
+def test_nbytes_reports_allocated_chunks():
+    log = DecayLog()
+    log.append(1, 0)
+    assert log.nbytes == DecayLog.CHUNK_SIZE * DECAY_RECORD.itemsize
+    log.extend(np.zeros(DecayLog.CHUNK_SIZE, dtype=np.uint32), 1)
+    assert log.nbytes == 2 * DecayLog.CHUNK_SIZE * DECAY_RECORD.itemsize
+
+
+def test_rewind_then_append_overwrites_the_tail():
+    log = SmallChunkLog()
+    log.extend(np.arange(30, dtype=np.uint32), 0)
+    log.extend(np.arange(30, dtype=np.uint32), 2)
+    log.rewind(12, 0)
+    log.extend(np.array([7, 8], dtype=np.uint32), 1)
+    assert log.size == 14
+    assert log.get_decay_count_at_step(1) == 2
+    assert log.get_decays_at_step(2).size == 0
+    with pytest.raises(ValueError):
+        log.rewind(20, 1)
+
+
+def test_steps_must_not_go_backwards():
+    log = DecayLog()
+    log.append(1, 5)
+    with pytest.raises(ValueError):
+        log.append(2, 4)
+
+
+def test_from_records_appends_after_the_given_records():
+    records = np.array([(3, 0), (4, 0), (9, 2)], dtype=DECAY_RECORD)
+    log = DecayLog.from_records(records)
+    log.extend(np.array([1], dtype=np.uint32), 3)
+    assert np.array_equal(log.get_all_decays()[:3], records)
+    assert log.get_decay_count_at_step(1) == 0
+    assert log.get_decay_count_at_step(3) == 1
+
+
+def test_mapped_log_round_trip(tmp_path):
+    path = str(tmp_path / "decays.log")
+    records, _ = _fill(DecayLog(), np.random.default_rng(1), num_steps=50)
+    with MappedDecayLog(path, "w+") as log:
+        for step in np.unique(records['decay_step']):
+            log.extend(records['atom_id'][records['decay_step'] == step], int(step))
+    reopened = MappedDecayLog(path, "r")
+    assert np.array_equal(reopened.get_all_decays(), records)
+    last = int(records['decay_step'][-1])
+    assert np.array_equal(reopened.get_decays_at_step(last),
+                          records[records['decay_step'] == last])
+    with pytest.raises(ValueError):
+        reopened.append(1, last + 1)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from radioactive_decay_visualizer import (
+    RNG_BACKENDS, RadioactiveDecaySimulator, make_rng, seed_from_json, seed_to_json)
+
+RUN = (3000, 5730, "years", 100)
+
+
+def _run(engine, **kwargs):
+    simulator = RadioactiveDecaySimulator(engine, seed=3, **kwargs)
+    _, remaining, _, _ = simulator.run_simulation(*RUN)
+    log = simulator.decay_list
+    return remaining, None if log is None else log.get_all_decays().copy()
+
+
+@pytest.mark.parametrize("backend", RNG_BACKENDS)
+def test_numpy_and_python_engines_are_bit_identical(backend):
+    numpy_remaining, numpy_log = _run("numpy", rng_backend=backend)
+    python_remaining, python_log = _run("python", rng_backend=backend)
+    assert numpy_remaining == python_remaining
+    assert np.array_equal(numpy_log, python_log)
+
+
+def test_threads_do_not_change_the_run():
+    serial = _run("numpy", rng_backend="counter")
+    threaded = _run("numpy", threads=2)
+    assert serial[0] == threaded[0]
+    assert np.array_equal(serial[1], threaded[1])
+
+
+@pytest.mark.parametrize("engine", ["numpy", "python", "event"])
+def test_skipping_the_decay_log_keeps_the_series(engine):
+    with_log = _run(engine)
+    without_log = _run(engine, keep_decay_log=False)
+    assert without_log[0] == with_log[0]
+    assert without_log[1] is None
+
+
+def test_decay_log_matches_the_series():
+    simulator = RadioactiveDecaySimulator(seed=11)
+    _, remaining, decayed, _ = simulator.run_simulation(*RUN)
+    counts = simulator.decay_list.get_decay_counts_per_step()
+    assert counts.sum() == decayed[-1] == RUN[0] - remaining[-1]
+    assert np.array_equal(np.cumsum(counts), decayed[:len(counts)])
+
+
+@pytest.mark.parametrize("backend", RNG_BACKENDS)
+def test_rng_state_round_trip(backend):
+    rng = make_rng(backend, 5)
+    first = np.empty(8)
+    rng.fill(first, 1, 0)
+    state = rng.get_state()
+    again = make_rng(backend, 5)
+    again.set_state(state)
+    a, b = np.empty(8), np.empty(8)
+    rng.fill(a, 2, 0)
+    again.fill(b, 2, 0)
+    assert np.array_equal(a, b)
+
+
+@pytest.mark.parametrize("seed", [None, 7, np.random.SeedSequence(2 ** 100, spawn_key=(4,))])
+def test_seed_json_round_trip(seed):
+    restored = seed_from_json(seed_to_json(seed))
+    assert seed_to_json(restored) == seed_to_json(seed)
+
+
+def test_adaptive_tolerance_means_finer_steps():
+    steps = []
+    for tolerance in (0.2, 0.05, 0.01):
+        simulator = RadioactiveDecaySimulator("binomial", seed=1)
+        delta_t_days, _ = simulator.calculate_step_size(5730, "years", 50)
+        duration = 3000 * delta_t_days
+        taken = sum(1 for _ in simulator.iter_adaptive(
+            10 ** 6, 5730, "years", duration, tolerance=tolerance)) - 1
+        assert taken <= simulator.max_adaptive_steps(5730, "years", duration,
+                                                     tolerance=tolerance)
+        steps.append(taken)
+    assert steps == sorted(steps)